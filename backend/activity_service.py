@@ -90,7 +90,9 @@ def get_activities(
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
     limit: int = 100,
-    skip: int = 0
+    skip: int = 0,
+    before_timestamp: Optional[datetime] = None,
+    before_id: Optional[int] = None
 ) -> List[UserActivityResponse]:
     """
     Get activities with optional filters
@@ -102,7 +104,9 @@ def get_activities(
         start_date: Filter by start date
         end_date: Filter by end date
         limit: Maximum number of results
-        skip: Number of results to skip
+        skip: Number of results to skip (prefer the before_* cursor for deep pages)
+        before_timestamp: Keyset cursor - only return activities older than this timestamp
+        before_id: Keyset cursor tie-breaker - id of the last activity on the previous page
     
     Returns:
         List of UserActivityResponse objects
@@ -132,6 +136,15 @@ def get_activities(
             where_clauses.append("ua.timestamp <= %s")
             params.append(end_date)
         
+        # Keyset pagination: seek past the last row of the previous page instead of
+        # making PostgreSQL scan and discard `skip` rows.
+        if before_timestamp and before_id is not None:
+            where_clauses.append("(ua.timestamp, ua.id) < (%s, %s)")
+            params.extend([before_timestamp, before_id])
+        elif before_timestamp:
+            where_clauses.append("ua.timestamp < %s")
+            params.append(before_timestamp)
+        
         where_clause = " AND ".join(where_clauses) if where_clauses else "1=1"
         
         query = f"""
@@ -144,7 +157,7 @@ def get_activities(
         LEFT JOIN users u ON ua.user_id = CAST(u.id AS VARCHAR)
         LEFT JOIN admin_users au ON ua.user_id = CAST(au.id AS VARCHAR)
         WHERE {where_clause}
-        ORDER BY ua.timestamp DESC
+        ORDER BY ua.timestamp DESC, ua.id DESC
         LIMIT %s OFFSET %s
         """
         
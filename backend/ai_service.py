@@ -1,11 +1,110 @@
 import json
 import re
+import threading
+import time
 import requests
-from typing import Optional, Dict, Any
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, List, Tuple
 from config import Config
 from database import db
 
+# Shared keep-alive session for GROK API calls so each request reuses a pooled TLS
+# connection instead of paying a fresh TCP+TLS handshake. Only failed connects (the
+# request never left) and 429/503 rejections are retried; read timeouts and 502/504
+# are not, since the billed completion may already be running upstream.
+grok_session = requests.Session()
+grok_session.mount("https://", HTTPAdapter(
+    pool_connections=8,
+    pool_maxsize=16,
+    max_retries=Retry(
+        total=2,
+        connect=2,
+        read=0,
+        status=2,
+        other=0,
+        backoff_factor=0.2,
+        status_forcelist=[429, 503],
+        respect_retry_after_header=True,
+        allowed_methods=frozenset({"POST"}),
+        raise_on_status=False
+    )
+))
+
+# Map keys with spaces (e.g. "  Entity Name: value") that the model sometimes emits
+_MAP_KEY_LINE_RE = re.compile(r'^(\s+)([A-Z][a-zA-Z\s-]+?):(\s+)(.+)', re.MULTILINE)
+_SNAKE_CASE_SPLIT_RE = re.compile(r'[\s-]+')
+
+_PROPERTY_FIXES = [
+    (re.compile(r'\bEntity Name:\s*'), 'entity_name: '),
+    (re.compile(r'\bEntity Acronym:\s*'), 'entity_acronym: '),
+    (re.compile(r'\bArticle Title:\s*'), 'article_title: '),
+    (re.compile(r'\barticle URL:\s*'), 'article_url: '),
+    (re.compile(r'\bRelationship Summary:\s*'), 'relationship_summary: '),
+    (re.compile(r'\bRelationship Date:\s*'), 'relationship_date: '),
+    (re.compile(r'\bRelationship Quality:\s*'), 'relationship_quality: '),
+    (re.compile(r'\bReceiver Name:\s*'), 'receiver_name: '),
+]
+
+# The schema only changes when the graph is re-imported, so sampling it for every
+# AI search is wasted round trips. Refresh at most every _SCHEMA_CACHE_TTL seconds.
+# The formatted prompt text is cached alongside it since that is what callers need.
+_SCHEMA_CACHE_TTL = 300
+_schema_cache: Dict[str, Any] = {"entry": None}  # (schema, prompt, fetched_at), swapped atomically
+_schema_cache_lock = threading.Lock()
+_SCHEMA_SAMPLE_WORKERS = 8
+_SCHEMA_IGNORED_PROPERTIES = frozenset({"id", "element_id"})
+
+def _get_cached_schema() -> Tuple[Dict[str, Any], str]:
+    entry = _schema_cache["entry"]
+    if entry is not None and time.monotonic() - entry[2] < _SCHEMA_CACHE_TTL:
+        return entry[0], entry[1]
+
+    with _schema_cache_lock:
+        # Another thread may have refreshed the cache while we waited for the lock
+        entry = _schema_cache["entry"]
+        if entry is not None and time.monotonic() - entry[2] < _SCHEMA_CACHE_TTL:
+            return entry[0], entry[1]
+
+        schema = _fetch_database_schema()
+        prompt = format_schema_for_prompt(schema)
+        # Don't pin a failed/empty fetch for the whole TTL
+        if schema["node_labels"]:
+            _schema_cache["entry"] = (schema, prompt, time.monotonic())
+        return schema, prompt
+
 def get_database_schema() -> Dict[str, Any]:
+    return _get_cached_schema()[0]
+
+def get_schema_prompt() -> str:
+    return _get_cached_schema()[1]
+
+def _sample_properties(sample_query: str, key: str) -> List[str]:
+    try:
+        sample_result = db.execute_query(sample_query)
+
+        properties = set()
+        for record in sample_result:
+            item = record.get(key, {})
+            if isinstance(item, dict):
+                for prop in item.keys():
+                    if prop not in _SCHEMA_IGNORED_PROPERTIES:
+                        properties.add(prop)
+
+        return list(properties)[:20]
+    except Exception as e:
+        return []
+
+def _sample_label_properties(label: str) -> List[str]:
+    label_escaped = f"`{label}`" if " " in label else label
+    return _sample_properties(f"MATCH (n:{label_escaped}) RETURN n LIMIT 5", "n")
+
+def _sample_relationship_properties(rel_type: str) -> List[str]:
+    rel_type_escaped = f"`{rel_type}`" if " " in rel_type or "_" in rel_type else rel_type
+    return _sample_properties(f"MATCH ()-[r:{rel_type_escaped}]->() RETURN r LIMIT 5", "r")
+
+def _fetch_database_schema() -> Dict[str, Any]:
     schema = {
         "node_labels": [],
         "relationship_types": [],
@@ -22,41 +121,14 @@ def get_database_schema() -> Dict[str, Any]:
         rel_types_result = db.execute_query(rel_types_query)
         schema["relationship_types"] = [record.get("relationshipType", "") for record in rel_types_result if record.get("relationshipType")]
 
-        for label in schema["node_labels"][:20]:
-            try:
-                label_escaped = f"`{label}`" if " " in label else label
-                sample_query = f"MATCH (n:{label_escaped}) RETURN n LIMIT 5"
-                sample_result = db.execute_query(sample_query)
-
-                properties = set()
-                for record in sample_result:
-                    node = record.get("n", {})
-                    if isinstance(node, dict):
-                        for key in node.keys():
-                            if key not in ["id", "element_id"]:
-                                properties.add(key)
-
-                schema["node_properties"][label] = list(properties)[:20]
-            except Exception as e:
-                schema["node_properties"][label] = []
-
-        for rel_type in schema["relationship_types"][:20]:
-            try:
-                rel_type_escaped = f"`{rel_type}`" if " " in rel_type or "_" in rel_type else rel_type
-                sample_query = f"MATCH ()-[r:{rel_type_escaped}]->() RETURN r LIMIT 5"
-                sample_result = db.execute_query(sample_query)
-
-                properties = set()
-                for record in sample_result:
-                    rel = record.get("r", {})
-                    if isinstance(rel, dict):
-                        for key in rel.keys():
-                            if key not in ["id", "element_id"]:
-                                properties.add(key)
-
-                schema["relationship_properties"][rel_type] = list(properties)[:20]
-            except Exception as e:
-                schema["relationship_properties"][rel_type] = []
+        # Each sample is an independent network round trip; run them concurrently
+        labels = schema["node_labels"][:20]
+        rel_types = schema["relationship_types"][:20]
+        with ThreadPoolExecutor(max_workers=_SCHEMA_SAMPLE_WORKERS) as executor:
+            label_properties = executor.map(_sample_label_properties, labels)
+            rel_type_properties = executor.map(_sample_relationship_properties, rel_types)
+            schema["node_properties"] = dict(zip(labels, label_properties))
+            schema["relationship_properties"] = dict(zip(rel_types, rel_type_properties))
 
     except Exception as e:
         pass
@@ -64,39 +136,38 @@ def get_database_schema() -> Dict[str, Any]:
     return schema
 
 def format_schema_for_prompt(schema: Dict[str, Any]) -> str:
-    schema_text = "Neo4j Database Schema:\n\n"
+    parts = ["Neo4j Database Schema:\n\n"]
 
-    schema_text += f"Node Labels ({len(schema['node_labels'])}):\n"
+    parts.append(f"Node Labels ({len(schema['node_labels'])}):\n")
     for label in schema["node_labels"][:30]:
         properties = schema["node_properties"].get(label, [])
-        schema_text += f"- {label}"
+        parts.append(f"- {label}")
         if properties:
-            schema_text += f" (properties: {', '.join(properties[:10])})"
-        schema_text += "\n"
+            parts.append(f" (properties: {', '.join(properties[:10])})")
+        parts.append("\n")
 
     if len(schema["node_labels"]) > 30:
-        schema_text += f"... and {len(schema['node_labels']) - 30} more labels\n"
+        parts.append(f"... and {len(schema['node_labels']) - 30} more labels\n")
 
-    schema_text += f"\nRelationship Types ({len(schema['relationship_types'])}):\n"
+    parts.append(f"\nRelationship Types ({len(schema['relationship_types'])}):\n")
     for rel_type in schema["relationship_types"][:20]:
         properties = schema["relationship_properties"].get(rel_type, [])
-        schema_text += f"- {rel_type}"
+        parts.append(f"- {rel_type}")
         if properties:
-            schema_text += f" (properties: {', '.join(properties[:10])})"
-        schema_text += "\n"
+            parts.append(f" (properties: {', '.join(properties[:10])})")
+        parts.append("\n")
 
     if len(schema["relationship_types"]) > 20:
-        schema_text += f"... and {len(schema['relationship_types']) - 20} more relationship types\n"
+        parts.append(f"... and {len(schema['relationship_types']) - 20} more relationship types\n")
 
-    return schema_text
+    return "".join(parts)
 
 def generate_cypher_query(user_query: str) -> Optional[str]:
     if not Config.GROK_API_KEY:
         raise ValueError("GROK_API_KEY is not configured. Please set it in your .env file.")
 
     try:
-        schema = get_database_schema()
-        schema_text = format_schema_for_prompt(schema)
+        schema_text = get_schema_prompt()
 
         prompt = f"""You are a Cypher query expert for Neo4j database.
 
@@ -212,7 +283,7 @@ Now generate the Cypher query for the user's query. Return ONLY the Cypher query
             "max_tokens": 2000
         }
 
-        response = requests.post(
+        response = grok_session.post(
             Config.GROK_API_URL,
             headers=headers,
             json=payload,
@@ -279,28 +350,12 @@ def validate_and_fix_cypher_query(query: str) -> str:
     if not query:
         return query
 
-    def convert_to_snake_case(name: str) -> str:
-        return re.sub(r'[\s-]+', '_', name).lower()
-
-    query = re.sub(
-        r'^(\s+)([A-Z][a-zA-Z\s-]+?):(\s+)(.+)',
-        lambda m: f"{m.group(1)}{convert_to_snake_case(m.group(2))}:{m.group(3)}{m.group(4)}",
-        query,
-        flags=re.MULTILINE
+    query = _MAP_KEY_LINE_RE.sub(
+        lambda m: f"{m.group(1)}{_SNAKE_CASE_SPLIT_RE.sub('_', m.group(2)).lower()}:{m.group(3)}{m.group(4)}",
+        query
     )
 
-    property_fixes = {
-        r'\bEntity Name:\s*': 'entity_name: ',
-        r'\bEntity Acronym:\s*': 'entity_acronym: ',
-        r'\bArticle Title:\s*': 'article_title: ',
-        r'\barticle URL:\s*': 'article_url: ',
-        r'\bRelationship Summary:\s*': 'relationship_summary: ',
-        r'\bRelationship Date:\s*': 'relationship_date: ',
-        r'\bRelationship Quality:\s*': 'relationship_quality: ',
-        r'\bReceiver Name:\s*': 'receiver_name: ',
-    }
-
-    for pattern, replacement in property_fixes.items():
-        query = re.sub(pattern, replacement, query)
+    for pattern, replacement in _PROPERTY_FIXES:
+        query = pattern.sub(replacement, query)
 
     return query
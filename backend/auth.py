@@ -1,8 +1,12 @@
 """
 Authentication utilities for JWT token management, password hashing, and OAuth
 """
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from typing import Optional
+import hashlib
+import threading
+import time
 from jose import JWTError, jwt
 import bcrypt
 from fastapi import Depends, HTTPException, status
@@ -22,6 +26,13 @@ SECRET_KEY = Config.JWT_SECRET_KEY if hasattr(Config, 'JWT_SECRET_KEY') else "yo
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30 * 24 * 60  # 30 days
 
+# Verified token payloads, keyed by a digest of the token so raw tokens are not kept around.
+# A browser session sends the same token on every request; this skips re-verifying the signature.
+TOKEN_CACHE_MAX_SIZE = 10000
+TOKEN_CACHE_TTL_SECONDS = 60
+_token_cache: "OrderedDict[bytes, tuple]" = OrderedDict()
+_token_cache_lock = threading.Lock()
+
 def verify_password(plain_password: str, hashed_password: str | bytes) -> bool:
     """Verify a password against its bcrypt hash. Accepts str or bytes for hashed_password."""
     try:
@@ -62,14 +73,32 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     return encoded_jwt
 
 def decode_access_token(token: str) -> Optional[dict]:
-    """Decode and verify a JWT token"""
+    """Decode and verify a JWT token (verified payloads are cached briefly, never past their exp)"""
+    cache_key = hashlib.blake2b(token.encode('utf-8'), digest_size=16).digest()
+    now = time.time()
+    with _token_cache_lock:
+        cached = _token_cache.get(cache_key)
+        if cached is not None:
+            if cached[0] > now:
+                return cached[1]
+            del _token_cache[cache_key]
+
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
     except JWTError as e:
         logger.error(f"JWT decode error: {e}")
         return None
 
+    cache_until = now + TOKEN_CACHE_TTL_SECONDS
+    exp = payload.get("exp")
+    if isinstance(exp, (int, float)):
+        cache_until = min(cache_until, exp)
+    with _token_cache_lock:
+        _token_cache[cache_key] = (cache_until, payload)
+        if len(_token_cache) > TOKEN_CACHE_MAX_SIZE:
+            _token_cache.popitem(last=False)
+    return payload
+
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
     """Dependency to get the current authenticated user from JWT token"""
     credentials_exception = HTTPException(
@@ -1,6 +1,7 @@
 from neo4j import GraphDatabase
 from neo4j.exceptions import ServiceUnavailable, TransientError, SessionExpired
 from config import Config
+import threading
 import time
 import logging
 
@@ -11,6 +12,7 @@ class Neo4jDatabase:
     def __init__(self):
         self.driver = None
         self._initialized = False
+        self._connect_lock = threading.Lock()
 
     def _connect(self):
         """Establish a new connection to Neo4j database"""
@@ -78,8 +80,14 @@ class Neo4jDatabase:
 
     def _ensure_connected(self):
         """Ensure database is connected before executing queries"""
-        # Check if we need to connect or reconnect
-        if not self._initialized or not self._check_connection():
+        # The driver keeps its own connection pool and health-checks pooled
+        # connections, so only (re)connect when not initialized; connection
+        # errors in execute_* clear _initialized to force a reconnect.
+        if self._initialized and self.driver:
+            return
+        with self._connect_lock:
+            if self._initialized and self.driver:
+                return
             try:
                 self._connect()
                 self._initialized = True
@@ -100,9 +108,6 @@ class Neo4jDatabase:
         
         for attempt in range(max_retries):
             try:
-                # Ensure connection is alive
-                self._ensure_connected()
-                
                 with self.get_session() as session:
                     result = session.run(query, parameters or {})
                     return [record.data() for record in result]
@@ -134,9 +139,6 @@ class Neo4jDatabase:
         
         for attempt in range(max_retries):
             try:
-                # Ensure connection is alive
-                self._ensure_connected()
-                
                 with self.get_session() as session:
                     result = session.run(query, parameters or {})
                     return [record.data() for record in result]
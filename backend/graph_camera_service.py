@@ -2,14 +2,113 @@
 Graph camera position service for PostgreSQL.
 Stores and retrieves the last saved graph view (camera position + target) per subscriber email.
 """
-from typing import Optional
-from datetime import datetime
+from typing import Optional, Dict, Tuple
+from datetime import datetime, timezone
 from neon_database import neon_db
+import atexit
 import logging
+import threading
+import time
 
 logger = logging.getLogger(__name__)
 
 
+# Camera saves fire on every pan/zoom gesture. Only the latest position per
+# subscriber matters, so saves are coalesced in memory and written out in one
+# upsert by a background flusher (at most FLUSH_INTERVAL_SECONDS stale). Writes are
+# best-effort: while Postgres is unreachable the flusher backs off up to
+# FLUSH_MAX_BACKOFF_SECONDS, saves are written synchronously so callers see the
+# failure, and rows still queued at process exit are lost if the final flush fails.
+FLUSH_INTERVAL_SECONDS = 0.5
+FLUSH_MAX_BACKOFF_SECONDS = 30.0
+
+_UPSERT_COLUMNS = (
+    "subscriber_email, position_x, position_y, position_z, "
+    "target_x, target_y, target_z, saved_at"
+)
+_UPSERT_ROW_PLACEHOLDER = "(%s, %s, %s, %s, %s, %s, %s, %s)"
+_UPSERT_CONFLICT_CLAUSE = """
+ON CONFLICT (subscriber_email) DO UPDATE SET
+    position_x = EXCLUDED.position_x,
+    position_y = EXCLUDED.position_y,
+    position_z = EXCLUDED.position_z,
+    target_x = EXCLUDED.target_x,
+    target_y = EXCLUDED.target_y,
+    target_z = EXCLUDED.target_z,
+    saved_at = EXCLUDED.saved_at
+WHERE graph_camera_positions.saved_at IS NULL
+   OR graph_camera_positions.saved_at <= EXCLUDED.saved_at
+"""
+
+_pending: Dict[str, Tuple] = {}
+_pending_lock = threading.Lock()
+_flusher_started = False
+_flush_failing = False
+
+
+def _flush_loop() -> None:
+    delay = FLUSH_INTERVAL_SECONDS
+    while True:
+        time.sleep(delay)
+        if flush_camera_positions():
+            delay = FLUSH_INTERVAL_SECONDS
+        else:
+            delay = min(delay * 2, FLUSH_MAX_BACKOFF_SECONDS)
+
+
+def _ensure_flusher() -> None:
+    global _flusher_started
+    if _flusher_started:
+        return
+    with _pending_lock:
+        if _flusher_started:
+            return
+        threading.Thread(target=_flush_loop, name="camera-position-flusher", daemon=True).start()
+        _flusher_started = True
+
+
+def flush_camera_positions() -> bool:
+    """Write all pending camera positions in a single multi-row upsert; False if the write failed."""
+    global _flush_failing
+    with _pending_lock:
+        if not _pending:
+            return True
+        batch = dict(_pending)
+        _pending.clear()
+
+    rows = list(batch.values())
+    query = (
+        f"INSERT INTO graph_camera_positions ({_UPSERT_COLUMNS}) VALUES "
+        + ", ".join([_UPSERT_ROW_PLACEHOLDER] * len(rows))
+        + _UPSERT_CONFLICT_CLAUSE
+    )
+    # saved_at is a naive TIMESTAMP column holding UTC
+    params = tuple(
+        value
+        for *values, saved_at in rows
+        for value in (*values, saved_at.astimezone(timezone.utc).replace(tzinfo=None))
+    )
+    try:
+        neon_db.execute_write_query(query, params)
+    except Exception as e:
+        # Log once per outage; the flusher keeps retrying with backoff
+        if not _flush_failing:
+            logger.exception("Error flushing %d graph camera positions: %s", len(rows), e)
+        _flush_failing = True
+        # Put the failed rows back unless a newer save arrived meanwhile
+        with _pending_lock:
+            for email, row in batch.items():
+                _pending.setdefault(email, row)
+        return False
+    if _flush_failing:
+        logger.info("Graph camera position writes recovered")
+        _flush_failing = False
+    return True
+
+
+atexit.register(flush_camera_positions)
+
+
 def save_camera_position(
     subscriber_email: str,
     position_x: float,
@@ -21,44 +120,52 @@ def save_camera_position(
 ) -> bool:
     """
     Save or update the graph camera position for a subscriber.
-    Uses upsert: insert new row per save (keep history) or update latest by email.
-    We store one row per user (latest overwrites) by deleting previous and inserting.
+    The position is queued and persisted by the background flusher; a newer
+    save for the same subscriber replaces any position not yet written. While
+    flushes are failing the queue is written synchronously and False is returned
+    if that write fails too (the position stays queued for the next retry).
     """
     try:
-        delete_query = """
-        DELETE FROM graph_camera_positions WHERE subscriber_email = %s
-        """
-        neon_db.execute_write_query(delete_query, (subscriber_email,))
-
-        insert_query = """
-        INSERT INTO graph_camera_positions
-        (subscriber_email, position_x, position_y, position_z, target_x, target_y, target_z, saved_at)
-        VALUES (%s, %s, %s, %s, %s, %s, %s, CURRENT_TIMESTAMP)
-        """
-        neon_db.execute_write_query(
-            insert_query,
-            (subscriber_email, position_x, position_y, position_z, target_x, target_y, target_z),
-        )
+        _ensure_flusher()
+        with _pending_lock:
+            _pending[subscriber_email] = (
+                subscriber_email, position_x, position_y, position_z,
+                target_x, target_y, target_z, datetime.now(timezone.utc),
+            )
+        if _flush_failing:
+            return flush_camera_positions()
         return True
     except Exception as e:
         logger.exception("Error saving graph camera position: %s", e)
         return False
 
 
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Timezone-aware UTC datetime for a stored saved_at (naive values are UTC)."""
+    if value is None or value.tzinfo is not None:
+        return value
+    return value.replace(tzinfo=timezone.utc)
+
+
 def get_camera_position(subscriber_email: str) -> Optional[dict]:
     """
-    Get the most recent saved graph camera position for a subscriber.
+    Get the saved graph camera position for a subscriber.
     Returns dict with position_x, position_y, position_z, target_x, target_y, target_z, saved_at,
     or None if not found.
     """
+    with _pending_lock:
+        pending = _pending.get(subscriber_email)
+    if pending:
+        keys = ("subscriber_email", "position_x", "position_y", "position_z",
+                "target_x", "target_y", "target_z", "saved_at")
+        return dict(zip(keys, pending))
+
     try:
         query = """
         SELECT subscriber_email, position_x, position_y, position_z,
                target_x, target_y, target_z, saved_at
         FROM graph_camera_positions
         WHERE subscriber_email = %s
-        ORDER BY saved_at DESC
-        LIMIT 1
         """
         rows = neon_db.execute_query(query, (subscriber_email,))
         if not rows:
@@ -72,7 +179,7 @@ def get_camera_position(subscriber_email: str) -> Optional[dict]:
             "target_x": float(row["target_x"]),
             "target_y": float(row["target_y"]),
             "target_z": float(row["target_z"]),
-            "saved_at": row["saved_at"],
+            "saved_at": _as_utc(row["saved_at"]),
         }
     except Exception as e:
         logger.exception("Error getting graph camera position: %s", e)
@@ -2,15 +2,17 @@
 import platform_fix
 
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, HTTPException, Depends, UploadFile, File, Form
+from fastapi import FastAPI, HTTPException, Depends, UploadFile, File, Form, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from typing import Optional, List
 import time
 import logging
 import os
+import json
 import aiofiles
 from config import Config
-from services import get_all_stories, get_graph_data, get_graph_data_by_section_and_country, get_gr_id_description, search_with_ai, get_story_statistics, get_all_node_types, get_calendar_data, get_cluster_data, get_entity_wikidata, get_wikidata_by_id, search_entity_wikidata
+from services import get_all_stories, get_graph_data, get_graph_data_by_section_and_country, get_gr_id_description, search_with_ai, get_story_statistics, get_story_statistics_batch, get_all_node_types, get_calendar_data, get_cluster_data, get_entity_wikidata, get_wikidata_by_id, search_entity_wikidata, clear_read_cache
 from models import GraphData, UserCreate, UserLogin, Token, UserResponse, GoogleAuthRequest, UserActivityCreate, UserActivityResponse, AdminLoginRequest, SubmissionCreate, SubmissionResponse, UserSubscriptionResponse, SubmissionUpdateRequest, GraphCameraPositionSave, GraphCameraPositionResponse
 from pydantic import BaseModel
 from auth import create_access_token, verify_google_token, get_current_user, get_current_admin_user
@@ -57,6 +59,20 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"Failed to initialize database: {e}")
         logger.warning("Application will continue, but database operations may fail")
+
+    # The story/section/statistics lookups seek on the indexes created by migrate_neo4j_indexes.py.
+    # Only the cheap index check runs here; `python migrate_neo4j_indexes.py --check` also scans for
+    # nodes imported since the last migration run.
+    from migrate_neo4j_indexes import check_neo4j_indexes
+    try:
+        missing_indexes = check_neo4j_indexes()
+        if missing_indexes:
+            logger.warning(
+                f"Missing Neo4j indexes: {', '.join(missing_indexes)}; "
+                "run `python migrate_neo4j_indexes.py` to create them"
+            )
+    except Exception as e:
+        logger.warning(f"Could not verify Neo4j indexes: {e}")
     
     yield
     
@@ -74,6 +90,8 @@ app = FastAPI(
     description="API for serving graph data from Neo4j database",
     version="1.0.0",
     lifespan=lifespan,
+    # Graph payloads carry thousands of nodes/links; orjson encodes them several times faster
+    default_response_class=ORJSONResponse,
 )
 
 app.add_middleware(
@@ -482,10 +500,13 @@ async def get_admin_activities(
     days: int = 7,
     limit: int = 100,
     skip: int = 0,
+    before_timestamp: Optional[datetime] = None,
+    before_id: Optional[int] = None,
     current_user: dict = Depends(get_current_admin_user)
 ):
     """
     Get user activities with filters (Admin only)
+    Pass the timestamp and id of the last activity as before_timestamp/before_id to fetch the next page.
     """
     try:
         start_date = datetime.utcnow() - timedelta(days=days) if days else None
@@ -496,7 +517,9 @@ async def get_admin_activities(
             activity_type=activity_type,
             start_date=start_date,
             limit=limit,
-            skip=skip
+            skip=skip,
+            before_timestamp=before_timestamp,
+            before_id=before_id
         )
         
         return activities
@@ -590,7 +613,6 @@ async def create_submission_endpoint(
         tags_list = []
         if tags:
             try:
-                import json
                 tags_list = json.loads(tags)
             except:
                 tags_list = []
@@ -874,10 +896,22 @@ async def health_check():
     
     return health_status
 
+STORIES_PAGE_MAX_SIZE = 200
+# Story/chapter/section listings, story statistics and node types only change on data imports,
+# so let browsers and proxies reuse them briefly instead of re-running the Neo4j scans.
+READ_CACHE_CONTROL = "public, max-age=60"
+
 @app.get("/api/stories", response_model=List[dict])
-async def get_stories():
+async def get_stories(response: Response, page: int = 1, size: Optional[int] = None):
+    """List all stories with chapters/sections; pass `size` (capped at 200) to page by `page` (1-based)."""
+    response.headers["Cache-Control"] = READ_CACHE_CONTROL
     try:
-        stories = get_all_stories()
+        if size is None:
+            stories = get_all_stories()
+        else:
+            size = max(1, min(size, STORIES_PAGE_MAX_SIZE))
+            page = max(1, page)
+            stories = get_all_stories(offset=(page - 1) * size, limit=size)
 
         return [story.model_dump() for story in stories]
     except Exception as e:
@@ -995,9 +1029,26 @@ async def get_cluster_endpoint(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching cluster data: {str(e)}")
 
+class StoryStatisticsBatchRequest(BaseModel):
+    story_ids: List[str]
+
+@app.post("/api/stories/statistics", response_model=dict)
+async def get_story_statistics_batch_endpoint(request: StoryStatisticsBatchRequest):
+    """Get statistics for several stories in one call, keyed by story id (at most 200 ids)."""
+    if len(request.story_ids) > STORIES_PAGE_MAX_SIZE:
+        raise HTTPException(status_code=400, detail=f"At most {STORIES_PAGE_MAX_SIZE} story ids per request")
+    try:
+        return get_story_statistics_batch(request.story_ids)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error fetching statistics for stories: {str(e)}"
+        )
+
 @app.get("/api/stories/{story_id}/statistics", response_model=dict)
-async def get_story_statistics_endpoint(story_id: str):
+async def get_story_statistics_endpoint(story_id: str, response: Response):
     """Get statistics for a story (total nodes, entity count, etc.)"""
+    response.headers["Cache-Control"] = READ_CACHE_CONTROL
     try:
         statistics = get_story_statistics(story_id)
         return statistics
@@ -1008,8 +1059,9 @@ async def get_story_statistics_endpoint(story_id: str):
         )
 
 @app.get("/api/node-types", response_model=List[str])
-async def get_node_types():
+async def get_node_types(response: Response):
     """Get all distinct node types from the database"""
+    response.headers["Cache-Control"] = READ_CACHE_CONTROL
     try:
         node_types = get_all_node_types()
         return node_types
@@ -1250,7 +1302,6 @@ async def execute_cypher_query(cypher_query: CypherQuery):
             reason = "schema query" if is_schema_query else ("simple record" if is_simple_record else "no graph data")
             # Convert results to JSON-serializable format
             # Neo4j records might contain special types that need conversion
-            import json
             def make_serializable(obj):
                 """Recursively convert object to JSON-serializable format"""
                 if obj is None:
@@ -1299,6 +1350,9 @@ async def execute_cypher_query(cypher_query: CypherQuery):
             detail=f"Error executing Cypher query: {str(e)}"
         )
 
+# Date properties, in priority order, folded into the precomputed `stats_date` read by story statistics
+STATS_DATE_PROPERTIES = ("date", "Date", "Relationship Date", "Action Date", "Process Date", "Disb Date")
+
 @app.post("/api/nodes/create")
 async def create_node(node_request: CreateNodeRequest):
     """
@@ -1328,7 +1382,7 @@ async def create_node(node_request: CreateNodeRequest):
                 section_lookup = db.execute_query(
                     """
                     MATCH (s:section)
-                    WHERE toString(s.gid) = toString($gid)
+                    WHERE coalesce(s.canonical_id, toString(s.gid)) = toString($gid)
                     RETURN s.`graph name` AS graph_name
                     LIMIT 1
                     """,
@@ -1337,7 +1391,7 @@ async def create_node(node_request: CreateNodeRequest):
                 if section_lookup and section_lookup[0].get("graph_name") is not None:
                     graph_name = section_lookup[0].get("graph_name")
                     # Primary membership field - node.gr_id = section.`graph name`
-                    properties.setdefault("gr_id", graph_name)
+                    properties.setdefault("gr_id", str(graph_name))
             except Exception as e:
                 logger.warning(f"[BACKEND] Could not resolve section `graph name` for section_gid={section_gid}: {e}")
 
@@ -1345,13 +1399,30 @@ async def create_node(node_request: CreateNodeRequest):
         if "gid" not in properties or properties.get("gid") in [None, ""]:
             import uuid
             properties["gid"] = uuid.uuid4().hex
-        
+
         # Clean category label - remove backticks if present, we'll add them properly
         clean_category = category
         if clean_category.startswith(':`'):
             clean_category = clean_category[2:]
         if clean_category.endswith('`'):
             clean_category = clean_category[:-1]
+
+        # Keep the lookup keys written by migrate_neo4j_indexes.py in step for new nodes
+        if properties.get("gr_id") is not None:
+            properties["gr_id"] = str(properties["gr_id"])
+        stats_date = next((properties[key] for key in STATS_DATE_PROPERTIES if properties.get(key) is not None), None)
+        if stats_date is not None:
+            properties.setdefault("stats_date", stats_date)
+        label_lower = clean_category.lower()
+        if label_lower == "gr_id":
+            if properties.get("category") is not None:
+                properties["category_norm"] = str(properties["category"]).strip().lower()
+            canonical_id = next((properties[key] for key in ("id", "g_id", "gid") if properties.get(key) is not None), None)
+            properties["canonical_id"] = str(canonical_id)
+        elif label_lower in ("story", "section"):
+            properties["canonical_id"] = str(properties["gid"])
+            if label_lower == "section" and properties.get("graph name") is not None:
+                properties["graph name"] = str(properties["graph name"])
         
         # Build Cypher CREATE query
         # Handle node labels with spaces using backticks
@@ -1399,6 +1470,8 @@ async def create_node(node_request: CreateNodeRequest):
                     status_code=500,
                     detail="Node creation failed: No result returned"
                 )
+            # Node types, labels, stories and statistics may all change with the new node
+            clear_read_cache()
             
             # Extract created node data
             # Neo4j returns records as dicts via record.data(), but 'n' might still be a Node object
@@ -1549,6 +1622,7 @@ async def delete_node(node_request: DeleteNodeRequest):
                 )
             
             logger.debug(f"[BACKEND] Node deleted. Count: {deleted_count}")
+            clear_read_cache()
 
             return {
                 "success": True,
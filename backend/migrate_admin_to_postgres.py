@@ -87,6 +87,7 @@ def create_admin_tables():
             "CREATE INDEX IF NOT EXISTS idx_user_activities_session_id ON user_activities(session_id);",
             "CREATE INDEX IF NOT EXISTS idx_user_activities_activity_type ON user_activities(activity_type);",
             "CREATE INDEX IF NOT EXISTS idx_user_activities_timestamp ON user_activities(timestamp);",
+            "CREATE INDEX IF NOT EXISTS idx_user_activities_timestamp_id ON user_activities(timestamp DESC, id DESC);",
             "CREATE INDEX IF NOT EXISTS idx_user_activities_section_id ON user_activities(section_id);"
         ]
         
@@ -119,9 +120,9 @@ def create_admin_tables():
         neon_db.execute_query(activities_table_query)
         logger.info("✓ user_activities table created")
         
-        for index_query in activities_indexes:
-            logger.info(f"Creating index: {index_query[:50]}...")
-            neon_db.execute_query(index_query)
+        # Send all index statements in one round trip, inside a single transaction
+        logger.info(f"Creating {len(activities_indexes)} indexes on user_activities...")
+        neon_db.execute_query("BEGIN;\n" + "\n".join(activities_indexes) + "\nCOMMIT;")
         
         logger.info("✓ All indexes created")
         
@@ -22,8 +22,7 @@ def create_graph_camera_table():
 
         query = """
         CREATE TABLE IF NOT EXISTS graph_camera_positions (
-            id SERIAL PRIMARY KEY,
-            subscriber_email VARCHAR(255) NOT NULL,
+            subscriber_email VARCHAR(255) PRIMARY KEY,
             position_x DOUBLE PRECISION NOT NULL,
             position_y DOUBLE PRECISION NOT NULL,
             position_z DOUBLE PRECISION NOT NULL,
@@ -36,12 +35,27 @@ def create_graph_camera_table():
         neon_db.execute_query(query)
         logger.info("✓ graph_camera_positions table created")
 
-        index_query = """
-        CREATE INDEX IF NOT EXISTS idx_graph_camera_positions_subscriber_email
-        ON graph_camera_positions(subscriber_email);
+        # Tables created by earlier versions of this script were keyed by an id SERIAL and
+        # could hold several rows per email. Keep the latest row and re-key by email; the
+        # primary key index replaces the old subscriber_email indexes.
+        upgrade_query = """
+        DO $$
+        BEGIN
+            IF EXISTS (SELECT 1 FROM information_schema.columns
+                      WHERE table_name='graph_camera_positions' AND column_name='id') THEN
+                DELETE FROM graph_camera_positions a
+                USING graph_camera_positions b
+                WHERE a.subscriber_email = b.subscriber_email
+                  AND (a.saved_at, a.id) < (b.saved_at, b.id);
+                ALTER TABLE graph_camera_positions DROP COLUMN id;
+                ALTER TABLE graph_camera_positions ADD PRIMARY KEY (subscriber_email);
+            END IF;
+        END $$;
+        DROP INDEX IF EXISTS idx_graph_camera_positions_subscriber_email;
+        DROP INDEX IF EXISTS idx_graph_camera_positions_subscriber_email_unique;
         """
-        neon_db.execute_query(index_query)
-        logger.info("✓ index on subscriber_email created")
+        neon_db.execute_query(upgrade_query)
+        logger.info("✓ graph_camera_positions keyed by subscriber_email")
 
         logger.info("Migration completed successfully")
     except Exception as e:
@@ -0,0 +1,191 @@
+"""
+Migration script to create Neo4j indexes for the story/chapter/section hierarchy
+(gr_id schema, plus the id and title lookups of the legacy :story/:section schema).
+Stores a normalized copy of gr_id.category (category_norm) and a string id
+(canonical_id) so hierarchy lookups can use an index seek instead of evaluating
+toLower(trim(...)) / toString(coalesce(...)) on every candidate node, and stores
+node.gr_id / section.`graph name` as strings with a gr_id index per member label,
+plus a single stats_date per member node for story statistics.
+Re-run after bulk imports of hierarchy nodes; `--check` reports what a run would still change.
+"""
+import re
+import sys
+from database import db
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Lookup indexes; the hierarchy queries in queries.py rely on these names existing
+INDEX_QUERIES = [
+    "CREATE INDEX gr_id_category_norm IF NOT EXISTS FOR (n:gr_id) ON (n.category_norm)",
+    "CREATE INDEX gr_id_canonical_id IF NOT EXISTS FOR (n:gr_id) ON (n.canonical_id)",
+    "CREATE INDEX gr_id_name IF NOT EXISTS FOR (n:gr_id) ON (n.name)",
+    "CREATE INDEX gr_id_story_name IF NOT EXISTS FOR (n:gr_id) ON (n.`Story Name`)",
+    "CREATE INDEX gr_id_section_name IF NOT EXISTS FOR (n:gr_id) ON (n.`Section Name`)",
+    "CREATE INDEX gr_id_graph_name IF NOT EXISTS FOR (n:gr_id) ON (n.`graph name`)",
+    # Legacy :story/:chapter/:section schema lookups
+    "CREATE INDEX story_canonical_id IF NOT EXISTS FOR (n:story) ON (n.canonical_id)",
+    "CREATE INDEX section_canonical_id IF NOT EXISTS FOR (n:section) ON (n.canonical_id)",
+    "CREATE INDEX story_story_name IF NOT EXISTS FOR (n:story) ON (n.`Story Name`)",
+    "CREATE INDEX section_section_name IF NOT EXISTS FOR (n:section) ON (n.`Section Name`)",
+    "CREATE INDEX section_graph_name IF NOT EXISTS FOR (n:section) ON (n.`graph name`)",
+]
+
+
+def check_neo4j_indexes():
+    """Return the names of the lookup indexes in INDEX_QUERIES that do not exist yet."""
+    existing = {row["name"] for row in db.execute_query("SHOW INDEXES YIELD name RETURN name")}
+    required = [re.search(r"CREATE INDEX (\w+)", query).group(1) for query in INDEX_QUERIES]
+    return [name for name in required if name not in existing]
+
+
+def check_neo4j_migration():
+    """Return what a migration run would still change (empty when fully migrated).
+
+    Checks the lookup indexes and looks for nodes missing the keys this migration writes
+    (category_norm, canonical_id, string gr_id, stats_date). The member check stops at the
+    first unmigrated node but scans all nodes with a gr_id when everything is migrated, so
+    it is only run on demand (--check), not at server startup.
+    """
+    problems = []
+    missing = check_neo4j_indexes()
+    if missing:
+        problems.append(f"missing Neo4j indexes: {', '.join(missing)}")
+
+    pending_checks = [
+        ("gr_id nodes without category_norm/canonical_id", """
+        MATCH (n:gr_id)
+        WHERE (n.category IS NOT NULL AND n.category_norm IS NULL)
+           OR (n.canonical_id IS NULL AND coalesce(n.id, n.g_id, n.gid) IS NOT NULL)
+        RETURN 1 AS pending LIMIT 1
+        """),
+        ("story/section nodes without canonical_id", """
+        MATCH (n)
+        WHERE (n:story OR n:section) AND NOT n:gr_id AND n.gid IS NOT NULL AND n.canonical_id IS NULL
+        RETURN 1 AS pending LIMIT 1
+        """),
+        ("nodes with a non-string gr_id or without stats_date", """
+        MATCH (n)
+        WHERE n.gr_id IS NOT NULL
+          AND (toString(n.gr_id) <> n.gr_id
+               OR (n.stats_date IS NULL
+                   AND coalesce(n.date, n.`Date`, n.`Relationship Date`, n.`Action Date`, n.`Process Date`, n.`Disb Date`) IS NOT NULL))
+        RETURN 1 AS pending LIMIT 1
+        """),
+    ]
+    for description, query in pending_checks:
+        if db.execute_query(query):
+            problems.append(description)
+    return problems
+
+
+def create_neo4j_indexes():
+    """Normalize gr_id categories and create lookup indexes in Neo4j."""
+    try:
+        normalize_query = """
+        MATCH (n:gr_id)
+        WHERE n.category IS NOT NULL
+          AND (n.category_norm IS NULL OR n.category_norm <> toLower(trim(n.category)))
+        SET n.category_norm = toLower(trim(n.category))
+        RETURN count(n) AS updated
+        """
+        result = db.execute_write_query(normalize_query)
+        updated = result[0]["updated"] if result else 0
+        logger.info(f"✓ gr_id.category_norm set on {updated} node(s)")
+
+        # canonical_id: the string id that story/section lookups compare against
+        canonical_queries = [
+            ("gr_id", """
+            MATCH (n:gr_id)
+            WITH n, toString(coalesce(n.id, n.g_id, n.gid)) AS canonical_id
+            WHERE canonical_id IS NOT NULL AND (n.canonical_id IS NULL OR n.canonical_id <> canonical_id)
+            SET n.canonical_id = canonical_id
+            RETURN count(n) AS updated
+            """),
+            ("story/section", """
+            MATCH (n)
+            WHERE (n:story OR n:section) AND NOT n:gr_id AND n.gid IS NOT NULL
+              AND (n.canonical_id IS NULL OR n.canonical_id <> toString(n.gid))
+            SET n.canonical_id = toString(n.gid)
+            RETURN count(n) AS updated
+            """),
+        ]
+        for label, query in canonical_queries:
+            result = db.execute_write_query(query)
+            updated = result[0]["updated"] if result else 0
+            logger.info(f"✓ {label} canonical_id set on {updated} node(s)")
+
+        # Section membership (node.gr_id = section.`graph name`) is compared as strings;
+        # store both sides as strings so the comparison needs no toString() and can use an index
+        membership_queries = [
+            ("node gr_id", """
+            MATCH (n)
+            WHERE n.gr_id IS NOT NULL AND toString(n.gr_id) <> n.gr_id
+            CALL { WITH n SET n.gr_id = toString(n.gr_id) } IN TRANSACTIONS OF 10000 ROWS
+            RETURN count(n) AS updated
+            """),
+            ("section graph name", """
+            MATCH (n:section)
+            WHERE n.`graph name` IS NOT NULL AND toString(n.`graph name`) <> n.`graph name`
+            SET n.`graph name` = toString(n.`graph name`)
+            RETURN count(n) AS updated
+            """),
+        ]
+        for label, query in membership_queries:
+            result = db.execute_write_query(query)
+            updated = result[0]["updated"] if result else 0
+            logger.info(f"✓ {label} stored as string on {updated} node(s)")
+
+        # stats_date: first date-like property, so statistics read one property per node
+        stats_date_query = """
+        MATCH (n)
+        WHERE n.gr_id IS NOT NULL
+        WITH n, coalesce(n.date, n.`Date`, n.`Relationship Date`, n.`Action Date`, n.`Process Date`, n.`Disb Date`) AS stats_date
+        WHERE stats_date IS NOT NULL AND (n.stats_date IS NULL OR n.stats_date <> stats_date)
+        CALL { WITH n, stats_date SET n.stats_date = stats_date } IN TRANSACTIONS OF 10000 ROWS
+        RETURN count(n) AS updated
+        """
+        result = db.execute_write_query(stats_date_query)
+        updated = result[0]["updated"] if result else 0
+        logger.info(f"✓ stats_date set on {updated} node(s)")
+
+        for query in INDEX_QUERIES:
+            db.execute_write_query(query)
+        logger.info("✓ gr_id and legacy hierarchy indexes created")
+
+        # One gr_id index per member label; statistics scan section members label by label
+        labels = [row["label"] for row in db.execute_query("CALL db.labels() YIELD label RETURN label")]
+        member_labels = [label for label in labels if label.lower() not in ("story", "chapter", "section", "gr_id")]
+        for label in member_labels:
+            index_name = "member_gr_id_" + re.sub(r"[^0-9a-z]+", "_", label.lower()).strip("_")
+            escaped = label.replace("`", "``")
+            db.execute_write_query(f"CREATE INDEX {index_name} IF NOT EXISTS FOR (n:`{escaped}`) ON (n.gr_id)")
+        logger.info(f"✓ gr_id indexes created for {len(member_labels)} member label(s)")
+
+        logger.info("Migration completed successfully")
+    except Exception as e:
+        logger.exception("Migration failed: %s", e)
+        sys.exit(1)
+    finally:
+        db.close()
+
+
+def report_neo4j_migration():
+    """Log what a migration run would still change; exit with status 1 if anything is pending."""
+    try:
+        problems = check_neo4j_migration()
+    finally:
+        db.close()
+    for problem in problems:
+        logger.warning(f"Pending: {problem}")
+    if problems:
+        sys.exit(1)
+    logger.info("✓ Neo4j lookup keys and indexes are up to date")
+
+
+if __name__ == "__main__":
+    if "--check" in sys.argv[1:]:
+        report_neo4j_migration()
+    else:
+        create_neo4j_indexes()
@@ -20,42 +20,15 @@ def create_subscription_tables():
         # Connect to database
         neon_db._connect()
         
-        # Add subscription columns to users table
-        users_subscription_columns = """
-        DO $$ 
-        BEGIN
-            IF NOT EXISTS (SELECT 1 FROM information_schema.columns 
-                          WHERE table_name='users' AND column_name='subscription_tier') THEN
-                ALTER TABLE users ADD COLUMN subscription_tier VARCHAR(50) DEFAULT 'free';
-            END IF;
-            
-            IF NOT EXISTS (SELECT 1 FROM information_schema.columns 
-                          WHERE table_name='users' AND column_name='subscription_status') THEN
-                ALTER TABLE users ADD COLUMN subscription_status VARCHAR(50) DEFAULT 'active';
-            END IF;
-            
-            IF NOT EXISTS (SELECT 1 FROM information_schema.columns 
-                          WHERE table_name='users' AND column_name='subscription_start_date') THEN
-                ALTER TABLE users ADD COLUMN subscription_start_date TIMESTAMP;
-            END IF;
-            
-            IF NOT EXISTS (SELECT 1 FROM information_schema.columns 
-                          WHERE table_name='users' AND column_name='subscription_end_date') THEN
-                ALTER TABLE users ADD COLUMN subscription_end_date TIMESTAMP;
-            END IF;
-        END $$;
-        """
-        
-        # Add subscription columns to admin_users table (for consistency)
-        admin_users_subscription_columns = """
-        DO $$ 
-        BEGIN
-            IF NOT EXISTS (SELECT 1 FROM information_schema.columns 
-                          WHERE table_name='admin_users' AND column_name='subscription_tier') THEN
-                ALTER TABLE admin_users ADD COLUMN subscription_tier VARCHAR(50) DEFAULT 'free';
-            END IF;
-        END $$;
-        """
+        # Subscription columns for users and admin_users (admin_users only gets the tier,
+        # for consistency): (table, column, definition)
+        subscription_columns = [
+            ("users", "subscription_tier", "VARCHAR(50) DEFAULT 'free'"),
+            ("users", "subscription_status", "VARCHAR(50) DEFAULT 'active'"),
+            ("users", "subscription_start_date", "TIMESTAMP"),
+            ("users", "subscription_end_date", "TIMESTAMP"),
+            ("admin_users", "subscription_tier", "VARCHAR(50) DEFAULT 'free'"),
+        ]
         
         # Create submissions table
         submissions_table_query = """
@@ -101,13 +74,25 @@ def create_subscription_tables():
             "CREATE INDEX IF NOT EXISTS idx_rate_limit_user_timestamp ON rate_limit_tracking(user_id, request_timestamp);"
         ]
         
-        logger.info("Adding subscription columns to users table...")
-        neon_db.execute_query(users_subscription_columns)
-        logger.info("✓ Subscription columns added to users table")
-        
-        logger.info("Adding subscription columns to admin_users table...")
-        neon_db.execute_query(admin_users_subscription_columns)
-        logger.info("✓ Subscription columns added to admin_users table")
+        logger.info("Adding subscription columns to users and admin_users tables...")
+        # Read existing columns once and only send the ALTERs that are actually needed
+        existing_columns = {
+            (row['table_name'], row['column_name'])
+            for row in neon_db.execute_query(
+                "SELECT table_name, column_name FROM information_schema.columns "
+                "WHERE table_name IN ('users', 'admin_users')"
+            )
+        }
+        missing_columns = [
+            f"ALTER TABLE {table} ADD COLUMN {column} {definition};"
+            for table, column, definition in subscription_columns
+            if (table, column) not in existing_columns
+        ]
+        if missing_columns:
+            neon_db.execute_query("BEGIN;\n" + "\n".join(missing_columns) + "\nCOMMIT;")
+            logger.info(f"✓ Added {len(missing_columns)} subscription column(s)")
+        else:
+            logger.info("✓ Subscription columns already present")
         
         logger.info("Creating submissions table...")
         neon_db.execute_query(submissions_table_query)
@@ -117,9 +102,9 @@ def create_subscription_tables():
         neon_db.execute_query(rate_limit_tracking_query)
         logger.info("✓ rate_limit_tracking table created")
         
-        for index_query in indexes:
-            logger.info(f"Creating index: {index_query[:60]}...")
-            neon_db.execute_query(index_query)
+        # Send all index statements in one round trip, inside a single transaction
+        logger.info(f"Creating {len(indexes)} indexes...")
+        neon_db.execute_query("BEGIN;\n" + "\n".join(indexes) + "\nCOMMIT;")
         
         logger.info("✓ All indexes created")
         
@@ -1,28 +1,15 @@
-from typing import Optional, Tuple, Dict, Any
+from functools import lru_cache
+from typing import Optional, Tuple, Dict, Any, List
 
 
-def get_all_stories_query():
-    """Query to fetch all stories with their chapters and sections.
-
-    Supports two Neo4j schemas:
-
-    1. gr_id unified schema (primary):
-       - All entities are :gr_id nodes; category distinguishes "story", "chapter", "section".
-       - Relationships: Chapter -[:IN_STORY]-> Story; Section -[:IN_CHAPTER]-> Chapter.
-       - Returns one row per story with key "story" containing nested chapters/sections.
-
-    2. Legacy schema (fallback):
-       - Nodes: :story, :chapter, :section
-       - Relationships: :story_chapter, :chapter_section
-    """
-    # gr_id unified schema (category-based story/chapter/section)
-    return """
+# gr_id unified schema (category-based story/chapter/section)
+_ALL_STORIES_QUERY = """
     MATCH (story:gr_id)
-    WHERE toLower(trim(coalesce(story.category, ''))) = 'story'
+    WHERE coalesce(story.category_norm, toLower(trim(story.category))) = 'story'
     OPTIONAL MATCH (story)<-[:IN_STORY]-(chapter:gr_id)
-    WHERE toLower(trim(coalesce(chapter.category, ''))) = 'chapter'
+    WHERE coalesce(chapter.category_norm, toLower(trim(chapter.category))) = 'chapter'
     OPTIONAL MATCH (chapter)<-[:IN_CHAPTER]-(section:gr_id)
-    WHERE toLower(trim(coalesce(section.category, ''))) = 'section'
+    WHERE coalesce(section.category_norm, toLower(trim(section.category))) = 'section'
     WITH story, chapter, section,
          toInteger(coalesce(toFloat(story.order), toFloat(story.`Story Number`), toFloat(story.`Story Number_new`), 0)) AS story_order,
          toInteger(coalesce(toFloat(chapter.`Chapter Number`), toFloat(chapter.`Chapter Number_new`), 0)) AS chapter_number,
@@ -64,12 +51,54 @@ def get_all_stories_query():
     ORDER BY story_order, story.id, story.g_id, story.name
     """
 
+# Cheap probe deciding which stories schema the database uses
+_HAS_GR_ID_STORIES_QUERY = """
+    MATCH (story:gr_id)
+    WHERE coalesce(story.category_norm, toLower(trim(story.category))) = 'story'
+    RETURN 1 AS found
+    LIMIT 1
+    """
+
+_STORIES_PAGE_CLAUSE = """
+    SKIP $offset LIMIT $limit
+    """
 
 
-def get_all_stories_query_legacy():
-    """Legacy query for :story/:chapter/:section schema with :story_chapter/:chapter_section.
-    Used when gr_id schema returns no results."""
-    return """
+def _page_stories_query(query: str, offset: int, limit: Optional[int]) -> Tuple[str, dict]:
+    """Append SKIP/LIMIT only when a page was requested; the listing is unpaged by default."""
+    if limit is None:
+        return query, {}
+    return query + _STORIES_PAGE_CLAUSE, {"offset": offset, "limit": limit}
+
+
+def get_all_stories_query(offset: int = 0, limit: Optional[int] = None) -> Tuple[str, dict]:
+    """Query to fetch all stories with their chapters and sections.
+
+    Supports two Neo4j schemas:
+
+    1. gr_id unified schema (primary):
+       - All entities are :gr_id nodes; category distinguishes "story", "chapter", "section"
+         (category_norm written by migrate_neo4j_indexes.py, else the lower-cased category).
+       - Relationships: Chapter -[:IN_STORY]-> Story; Section -[:IN_CHAPTER]-> Chapter.
+       - Returns one row per story with key "story" containing nested chapters/sections.
+
+    2. Legacy schema (fallback):
+       - Nodes: :story, :chapter, :section
+       - Relationships: :story_chapter, :chapter_section
+
+    All stories are returned unless a limit is given, in which case the rows are paged
+    with SKIP $offset LIMIT $limit.
+    """
+    return _page_stories_query(_ALL_STORIES_QUERY, offset, limit)
+
+
+def has_gr_id_stories_query() -> Tuple[str, dict]:
+    """Query returning one row when any gr_id story exists (i.e. the gr_id schema is in use)."""
+    return _HAS_GR_ID_STORIES_QUERY, {}
+
+
+
+_ALL_STORIES_LEGACY_QUERY = """
     MATCH (story:story)
     OPTIONAL MATCH (story)-[:story_chapter]-(chapter:chapter)
     OPTIONAL MATCH (chapter)-[:chapter_section]-(section:section)
@@ -116,44 +145,68 @@ def get_all_stories_query_legacy():
     ORDER BY story_number, story.gid
     """
 
-def get_story_statistics_query(story_gid: Optional[str] = None, story_title: Optional[str] = None):
-    """Statistics for a story. New schema: gr_id nodes with IN_STORY, IN_CHAPTER."""
+def get_all_stories_query_legacy(offset: int = 0, limit: Optional[int] = None) -> Tuple[str, dict]:
+    """Legacy query for :story/:chapter/:section schema with :story_chapter/:chapter_section.
+    Used when the database has no gr_id stories at all."""
+    return _page_stories_query(_ALL_STORIES_LEGACY_QUERY, offset, limit)
+
+def _select_story_param(story_gid: Optional[str], story_title: Optional[str],
+                        story_key: Optional[str] = None) -> Tuple[str, str]:
+    """Pick the story lookup to use; the key doubles as the query parameter name."""
     if story_gid:
-        match_clause = """
+        return "story_gid", story_gid
+    if story_title:
+        return "story_title", story_title
+    if story_key:
+        return "story_key", story_key
+    raise ValueError("Either story_gid, story_title or story_key must be provided")
+
+
+_STORY_STATISTICS_MATCH_CLAUSES = {
+    "story_gid": """
         MATCH (story:gr_id)
-        WHERE toLower(trim(coalesce(story.category, ''))) = 'story'
-          AND (toString(coalesce(story.id, story.g_id)) = toString($story_gid)
-               OR toString(story.name) = toString($story_gid))
-        """
-        params = {"story_gid": story_gid}
-    elif story_title:
-        match_clause = """
+        WHERE (coalesce(story.canonical_id, toString(coalesce(story.id, story.g_id, story.gid))) = toString($story_gid)
+               OR story.name = toString($story_gid))
+          AND coalesce(story.category_norm, toLower(trim(story.category))) = 'story'
+        """,
+    "story_title": """
         MATCH (story:gr_id)
-        WHERE toLower(trim(coalesce(story.category, ''))) = 'story'
-          AND (story.name = $story_title OR story.`Story Name` = $story_title)
-        """
-        params = {"story_title": story_title}
-    else:
-        raise ValueError("Either story_gid or story_title must be provided")
-
-    # Use relationship-based matching (section)-[*1..5]-(n) - same as graph data query
-    query = f"""
+        WHERE (story.name = $story_title OR story.`Story Name` = $story_title)
+          AND coalesce(story.category_norm, toLower(trim(story.category))) = 'story'
+        """,
+    # Id or title in one lookup; an id match wins over a title match.
+    "story_key": """
+        MATCH (story:gr_id)
+        WHERE (coalesce(story.canonical_id, toString(coalesce(story.id, story.g_id, story.gid))) = toString($story_key)
+               OR story.name = toString($story_key)
+               OR story.`Story Name` = $story_key)
+          AND coalesce(story.category_norm, toLower(trim(story.category))) = 'story'
+        WITH story
+        ORDER BY CASE WHEN coalesce(story.canonical_id, toString(coalesce(story.id, story.g_id, story.gid))) = toString($story_key) THEN 0 ELSE 1 END
+        LIMIT 1
+        """,
+}
+
+# Use relationship-based matching (section)-[*1..5]-(n) - same as graph data query
+_STORY_STATISTICS_TEMPLATE = """
     {match_clause}
     OPTIONAL MATCH (story)<-[:IN_STORY]-(chapter:gr_id)
-    WHERE toLower(trim(coalesce(chapter.category, ''))) = 'chapter'
+    WHERE coalesce(chapter.category_norm, toLower(trim(chapter.category))) = 'chapter'
     OPTIONAL MATCH (chapter)<-[:IN_CHAPTER]-(section:gr_id)
-    WHERE toLower(trim(coalesce(section.category, ''))) = 'section'
+    WHERE coalesce(section.category_norm, toLower(trim(section.category))) = 'section'
     WITH story, COLLECT(DISTINCT section) AS sections
-    UNWIND CASE WHEN size(sections) = 0 OR sections[0] IS NULL THEN [null] ELSE sections END AS section
-    OPTIONAL MATCH (section)-[*1..5]-(n)
-    WHERE (section IS NOT NULL AND NONE(l IN labels(n) WHERE toLower(l) = 'gr_id')) OR section IS NULL
-    WITH story, n
-    WITH story, COLLECT(DISTINCT n) AS node_list
-    WITH story, [x IN node_list WHERE x IS NOT NULL] AS nodes_only
-    WITH story,
-         size(nodes_only) AS total_nodes,
-         size([x IN nodes_only WHERE ANY(l IN labels(x) WHERE toLower(l) = 'entity')]) AS entity_count,
-         REDUCE(max_date = null, x IN [x IN nodes_only | coalesce(x.date, x.`Date`, x.`Relationship Date`, x.`Action Date`, x.`Process Date`, x.`Disb Date`)] | CASE WHEN max_date IS NULL OR x > max_date THEN x ELSE max_date END) AS updated_date
+    // Aggregating subquery: always yields one row, so a story without sections gets zeros
+    // without a placeholder section, and the expansion only ever starts from real sections.
+    CALL {{
+      WITH sections
+      UNWIND sections AS section
+      MATCH (section)-[*1..5]-(n)
+      WHERE NONE(l IN labels(n) WHERE toLower(l) = 'gr_id')
+      WITH DISTINCT n
+      RETURN count(n) AS total_nodes,
+             count(CASE WHEN ANY(l IN labels(n) WHERE toLower(l) = 'entity') THEN n END) AS entity_count,
+             max(coalesce(n.date, n.`Date`, n.`Relationship Date`, n.`Action Date`, n.`Process Date`, n.`Disb Date`)) AS updated_date
+    }}
 
     RETURN {{
       story_id: coalesce(story.id, story.g_id, story.name, elementId(story)),
@@ -161,22 +214,44 @@ def get_story_statistics_query(story_gid: Optional[str] = None, story_title: Opt
       total_nodes: total_nodes,
       entity_count: entity_count,
       highlighted_nodes: 0,
-      updated_date: "2026-01-20"
+      updated_date: toString(updated_date)
     }} AS statistics
     """
-    
-    return query, params
 
-def get_story_by_id_query(story_id: str):
-    """Query to fetch a specific story by ID (using Story Name/Number or gid).
-
-    Updated for the new Neo4j schema:
-    - Nodes: :story, :chapter, :section
-    - Relationships: :story_chapter, :chapter_section
+_STORY_STATISTICS_QUERIES = {
+    key: _STORY_STATISTICS_TEMPLATE.format(match_clause=clause)
+    for key, clause in _STORY_STATISTICS_MATCH_CLAUSES.items()
+}
+
+def get_story_statistics_query(story_gid: Optional[str] = None, story_title: Optional[str] = None,
+                               story_key: Optional[str] = None):
+    """Statistics for a story. New schema: gr_id nodes with IN_STORY, IN_CHAPTER.
+    story_key matches either the story id or its title in a single query."""
+    key, value = _select_story_param(story_gid, story_title, story_key)
+    return _STORY_STATISTICS_QUERIES[key], {key: value}
+
+# Batch form: the story_key lookup and statistics run once per requested key inside a CALL
+# subquery, so all stories on a page are served by a single round trip.
+_STORY_STATISTICS_BATCH_TEMPLATE = """
+    UNWIND $story_ids AS story_key
+    CALL {{
+      WITH story_key
+      {body}
+    }}
+    RETURN story_key, statistics
     """
-    return """
+
+_STORY_STATISTICS_BATCH_QUERY = _STORY_STATISTICS_BATCH_TEMPLATE.format(
+    body=_STORY_STATISTICS_QUERIES["story_key"].replace("$story_key", "story_key")
+)
+
+def get_story_statistics_batch_query(story_ids: List[str]) -> Tuple[str, dict]:
+    """Statistics for several stories (id or title per key) in one query; one row per matched key."""
+    return _STORY_STATISTICS_BATCH_QUERY, {"story_ids": [str(story_id) for story_id in story_ids]}
+
+_STORY_BY_ID_QUERY = """
     MATCH (story:story)
-    WHERE toString(story.gid) = $story_id
+    WHERE coalesce(story.canonical_id, toString(story.gid)) = $story_id
        OR story.`Story Name` = $story_id
        OR toString(story.`Story Number`) = $story_id
        OR toString(story.`Story Number_new`) = $story_id
@@ -208,61 +283,65 @@ def get_story_by_id_query(story_id: str):
         story_brief: "",
         chapters: [c IN chapters WHERE c.gid IS NOT NULL ORDER BY c.chapter_number]
     } AS story
-    """, {"story_id": story_id}
-
-def get_graph_data_by_section_query(section_gid: Optional[str] = None, section_query: Optional[str] = None, section_title: Optional[str] = None) -> Tuple[str, dict]:
     """
-    Query to fetch graph data (nodes and links) for a section.
-
-    Primary: gr_id schema — section is :gr_id with category='section'. We scope nodes by the
-    section's graph/id (same idea as legacy: only nodes that "belong" to this section), so we get
-    a small section-specific subgraph (tens of nodes), not the whole DB.
 
-    - Section scope = section.`graph name` or section.g_id / section.gid / section.id.
-    - Include only nodes whose gr_id/g_id/gid matches that scope (or that are 1 hop from section).
-    - Then relationships between those nodes only.
+def get_story_by_id_query(story_id: str):
+    """Query to fetch a specific story by ID (using Story Name/Number or gid).
 
-    Fallback: legacy :section schema in get_graph_data_by_section_query_legacy.
+    Updated for the new Neo4j schema:
+    - Nodes: :story, :chapter, :section
+    - Relationships: :story_chapter, :chapter_section
     """
+    return _STORY_BY_ID_QUERY, {"story_id": story_id}
+
+def _select_section_param(section_gid: Optional[str], section_query: Optional[str], section_title: Optional[str]) -> Tuple[str, str]:
+    """Pick the section lookup to use; the key doubles as the query parameter name."""
     if section_gid:
-        match_clause = """
+        return "section_gid", section_gid
+    if section_query:
+        return "section_query", section_query
+    if section_title:
+        return "section_title", section_title
+    raise ValueError("At least one of section_gid, section_query, or section_title must be provided")
+
+
+_GRAPH_DATA_BY_SECTION_MATCH_CLAUSES = {
+    "section_gid": """
         MATCH (section:gr_id)
-        WHERE toLower(trim(coalesce(section.category, ''))) = 'section'
-          AND toString(coalesce(section.id, section.g_id, section.gid)) = toString($section_gid)
-        """
-        params = {"section_gid": section_gid}
-    elif section_query:
-        match_clause = """
+        WHERE coalesce(section.canonical_id, toString(coalesce(section.id, section.g_id, section.gid))) = toString($section_gid)
+          AND coalesce(section.category_norm, toLower(trim(section.category))) = 'section'
+        """,
+    "section_query": """
         MATCH (section:gr_id)
-        WHERE toLower(trim(coalesce(section.category, ''))) = 'section'
-          AND (toString(coalesce(section.id, section.g_id, section.gid)) = toString($section_query)
+        WHERE (coalesce(section.canonical_id, toString(coalesce(section.id, section.g_id, section.gid))) = toString($section_query)
                OR section.name = $section_query
                OR section.`Section Name` = $section_query
                OR section.`graph name` = $section_query)
-        """
-        params = {"section_query": section_query}
-    elif section_title:
-        match_clause = """
+          AND coalesce(section.category_norm, toLower(trim(section.category))) = 'section'
+        """,
+    "section_title": """
         MATCH (section:gr_id)
-        WHERE toLower(trim(coalesce(section.category, ''))) = 'section'
-          AND (section.name = $section_title
+        WHERE (section.name = $section_title
                OR section.`Section Name` = $section_title
                OR section.`graph name` = $section_title)
-        """
-        params = {"section_title": section_title}
-    else:
-        raise ValueError("At least one of section_gid, section_query, or section_title must be provided")
+          AND coalesce(section.category_norm, toLower(trim(section.category))) = 'section'
+        """,
+}
 
-    # Get section's immediate subgraph: nodes within 1..2 hops (keeps result small, tens of nodes).
-    # Also include nodes that match section scope by gr_id if any (for schemas where that is set).
-    query = f"""
+# Get section's immediate subgraph: nodes within 1..2 hops (keeps result small, tens of nodes).
+# Also include nodes that match section scope by gr_id if any (for schemas where that is set).
+_GRAPH_DATA_BY_SECTION_TEMPLATE = """
     {match_clause}
     WITH section
-    // Nodes within 2 hops of section (section-specific subgraph) — exclude other gr_id hierarchy nodes
-    OPTIONAL MATCH (section)-[*1..2]-(node)
-    WHERE NONE(l IN labels(node) WHERE toLower(l) = 'gr_id')
-    WITH section, COLLECT(DISTINCT node) AS hopNodes
-    WITH section, [n IN hopNodes WHERE n IS NOT NULL] AS fromHops
+    // Nodes within 2 hops of section (section-specific subgraph) — exclude other gr_id hierarchy nodes.
+    // Expanded hop by hop with a DISTINCT in between so the second hop starts once per neighbour
+    // instead of once per [*1..2] path.
+    OPTIONAL MATCH (section)--(hop1)
+    WITH section, COLLECT(DISTINCT hop1) AS hop1Nodes
+    UNWIND CASE WHEN size(hop1Nodes) = 0 THEN [null] ELSE hop1Nodes END AS via
+    OPTIONAL MATCH (via)--(hop2)
+    WITH section, hop1Nodes, COLLECT(DISTINCT hop2) AS hop2Nodes
+    WITH section, [n IN hop1Nodes + hop2Nodes WHERE NONE(l IN labels(n) WHERE toLower(l) = 'gr_id')] AS fromHops
     // Also include nodes that belong to section by gr_id/g_id/gid (legacy-style scope)
     WITH section, fromHops,
          toString(coalesce(section.`graph name`, section.name, section.g_id, section.gid, section.id)) AS section_scope
@@ -273,8 +352,14 @@ def get_graph_data_by_section_query(section_gid: Optional[str] = None, section_q
     WITH [n IN scopeNodes WHERE n IS NOT NULL] + fromHops AS combined
     UNWIND combined AS n
     WITH COLLECT(DISTINCT n) AS all_nodes
+    // Relationships between collected nodes: expand each node's outgoing relationships once,
+    // so every relationship is seen a single time (no undirected match + id(a) < id(b) filter).
+    // Self-loops stay excluded, as the id(a) < id(b) filter did.
+    UNWIND CASE WHEN size(all_nodes) = 0 THEN [null] ELSE all_nodes END AS a
+    OPTIONAL MATCH (a)-[rel]->(b)
+    WHERE b IN all_nodes AND b <> a
     WITH all_nodes,
-         [(a)-[rel]-(b) WHERE a IN all_nodes AND b IN all_nodes AND id(a) < id(b) | {{ rel: rel, from: a, to: b }}] AS all_rels
+         COLLECT(CASE WHEN rel IS NOT NULL THEN {{ rel: rel, from: a, to: b }} END) AS all_rels
     RETURN {{
       nodes: [n IN all_nodes | n {{
         .*,
@@ -298,36 +383,45 @@ def get_graph_data_by_section_query(section_gid: Optional[str] = None, section_q
       }}]
     }} AS graphData
     """
-    return query, params
 
+_GRAPH_DATA_BY_SECTION_QUERIES = {
+    key: _GRAPH_DATA_BY_SECTION_TEMPLATE.format(match_clause=clause)
+    for key, clause in _GRAPH_DATA_BY_SECTION_MATCH_CLAUSES.items()
+}
 
-def get_graph_data_by_section_query_legacy(section_gid: Optional[str] = None, section_query: Optional[str] = None, section_title: Optional[str] = None) -> Tuple[str, dict]:
+def get_graph_data_by_section_query(section_gid: Optional[str] = None, section_query: Optional[str] = None, section_title: Optional[str] = None) -> Tuple[str, dict]:
     """
-    Legacy graph query for :section schema: section.`graph name` and node.gr_id matching.
-    Used when gr_id schema returns no graph data.
+    Query to fetch graph data (nodes and links) for a section.
+
+    Primary: gr_id schema — section is :gr_id with category='section'. We scope nodes by the
+    section's graph/id (same idea as legacy: only nodes that "belong" to this section), so we get
+    a small section-specific subgraph (tens of nodes), not the whole DB.
+
+    - Section scope = section.`graph name` or section.g_id / section.gid / section.id.
+    - Include only nodes whose gr_id/g_id/gid matches that scope (or that are 1 hop from section).
+    - Then relationships between those nodes only.
+
+    Fallback: legacy :section schema in get_graph_data_by_section_query_legacy.
     """
-    if section_gid:
-        match_clause = "MATCH (section:section) WHERE toString(section.gid) = toString($section_gid)"
-        params = {"section_gid": section_gid}
-    elif section_query:
-        match_clause = """
+    key, value = _select_section_param(section_gid, section_query, section_title)
+    return _GRAPH_DATA_BY_SECTION_QUERIES[key], {key: value}
+
+_GRAPH_DATA_BY_SECTION_LEGACY_MATCH_CLAUSES = {
+    "section_gid": "MATCH (section:section) WHERE coalesce(section.canonical_id, toString(section.gid)) = toString($section_gid)",
+    "section_query": """
         MATCH (section:section)
-        WHERE toString(section.gid) = toString($section_query)
+        WHERE coalesce(section.canonical_id, toString(section.gid)) = toString($section_query)
            OR section.`Section Name` = $section_query
            OR section.`graph name` = $section_query
-        """
-        params = {"section_query": section_query}
-    elif section_title:
-        match_clause = """
+        """,
+    "section_title": """
         MATCH (section:section)
         WHERE section.`Section Name` = $section_title
            OR section.`graph name` = $section_title
-        """
-        params = {"section_title": section_title}
-    else:
-        raise ValueError("At least one of section_gid, section_query, or section_title must be provided")
+        """,
+}
 
-    query = f"""
+_GRAPH_DATA_BY_SECTION_LEGACY_TEMPLATE = """
     {match_clause}
     WITH section, toString(section.`graph name`) AS section_graph_name
 
@@ -372,82 +466,161 @@ def get_graph_data_by_section_query_legacy(section_gid: Optional[str] = None, se
       }}]
     }} AS graphData
     """
-    return query, params
 
+_GRAPH_DATA_BY_SECTION_LEGACY_QUERIES = {
+    key: _GRAPH_DATA_BY_SECTION_LEGACY_TEMPLATE.format(match_clause=clause)
+    for key, clause in _GRAPH_DATA_BY_SECTION_LEGACY_MATCH_CLAUSES.items()
+}
 
-def get_cluster_data_query(
-    node_type: str,
-    property_key: str,
-    section_query: Optional[str] = None,
-    cluster_limit: int = 5,
-    node_limit: int = 10
-) -> Tuple[str, dict]:
+def get_graph_data_by_section_query_legacy(section_gid: Optional[str] = None, section_query: Optional[str] = None, section_title: Optional[str] = None) -> Tuple[str, dict]:
     """
-    Query to fetch clustered node samples grouped by a given property key.
-
-    - `node_type` is expected to be a frontend normalized label (e.g. "place_of_performance", "entity", "action").
-      We match it against actual Neo4j labels using a normalized comparison:
-        replace(toLower(label), ' ', '_') == node_type  OR  toLower(label) == node_type
-    - `property_key` is the Neo4j property name to cluster by.
-    - Optionally filters to a section via `n.section = section_query` if provided.
-
-    Returns a dict shape:
-      {
-        node_type, property_key, section_query,
-        clusters: [{ value, count, nodes: [{id,name}, ...] }, ...]
-      }
+    Legacy graph query for :section schema: section.`graph name` and node.gr_id matching.
+    Used when gr_id schema returns no graph data.
     """
+    key, value = _select_section_param(section_gid, section_query, section_title)
+    return _GRAPH_DATA_BY_SECTION_LEGACY_QUERIES[key], {key: value}
 
-    query = """
+# The clustered property is inlined as an escaped identifier (rather than n[$property_key])
+# so each key gets its own cacheable plan with a direct property read. Labels resolved from
+# $node_type are inlined the same way as a label expression, so only those labels are scanned.
+_CLUSTER_DATA_TEMPLATE = """
     // Resolve section filter to section.`graph name` if provided.
     WITH $section_query AS section_query
     OPTIONAL MATCH (sec:section)
     WHERE section_query IS NOT NULL
       AND (
-        toString(sec.gid) = toString(section_query)
+        coalesce(sec.canonical_id, toString(sec.gid)) = toString(section_query)
         OR sec.`Section Name` = section_query
         OR sec.`graph name` = section_query
       )
     WITH section_query, toString(sec.`graph name`) AS section_graph_name
+{clusters}
+    WITH collect({{
+      value: propVal,
+      count: count,
+      nodes: nodes
+    }}) AS clusters
+    RETURN {{
+      node_type: $node_type,
+      property_key: $property_key,
+      section_query: $section_query,
+      clusters: clusters
+    }} AS clusterData
+    """
 
+_CLUSTER_NODE_MAP = """{
+        id: coalesce(toString(n.gid), toString(n.id), toString(id(n))),
+        name: coalesce(
+          n.name,
+          n.`Entity Name`,
+          n.`Action Text`,
+          n.`Result Name`,
+          n.`Process Name`,
+          n.`Relationship NAME`,
+          n.`Country Name`,
+          toString(n.gid),
+          toString(id(n))
+        )
+      }"""
+
+# Concrete labels: count members per value first, then sample members for the returned
+# clusters only. Each phase-2 scan is a label scan that LIMIT stops early.
+_CLUSTER_TWO_PHASE_TEMPLATE = """
+    // Phase 1: only count members per value, keeping the top $cluster_limit values
+    MATCH (n{label_expr})
+    WHERE n.{property} IS NOT NULL
+      AND (
+        section_query IS NULL
+        OR toString(n.gr_id) = section_graph_name
+      )
+    WITH section_query, section_graph_name, toString(n.{property}) AS propVal, count(DISTINCT n) AS count
+    ORDER BY count DESC, propVal ASC
+    LIMIT $cluster_limit
+
+    // Phase 2: sample members for the returned clusters only; LIMIT stops each scan early
+    CALL {{
+      WITH section_query, section_graph_name, propVal
+      MATCH (n{label_expr})
+      WHERE toString(n.{property}) = propVal
+        AND (
+          section_query IS NULL
+          OR toString(n.gr_id) = section_graph_name
+        )
+      WITH n LIMIT $node_limit
+      RETURN collect({node_map}) AS nodes
+    }}"""
+
+# Labels unknown: every node has to be tested against $node_type, so a per-cluster rescan
+# would be a full graph scan per cluster. Collect the members in the one pass and slice.
+_CLUSTER_SINGLE_PASS_TEMPLATE = """
     MATCH (n)
     WHERE ANY(l IN labels(n) WHERE replace(toLower(l), ' ', '_') = $node_type OR toLower(l) = $node_type)
-      AND n[$property_key] IS NOT NULL
+      AND n.{property} IS NOT NULL
       AND (
         section_query IS NULL
         OR toString(n.gr_id) = section_graph_name
       )
-    WITH n, toString(n[$property_key]) AS propVal
+    WITH n, toString(n.{property}) AS propVal
     WITH propVal,
-         collect(DISTINCT {
-            id: coalesce(toString(n.gid), toString(n.id), toString(id(n))),
-            name: coalesce(
-              n.name,
-              n.`Entity Name`,
-              n.`Action Text`,
-              n.`Result Name`,
-              n.`Process Name`,
-              n.`Relationship NAME`,
-              n.`Country Name`,
-              toString(n.gid),
-              toString(id(n))
-            )
-         }) AS nodes,
+         collect(DISTINCT {node_map}) AS nodes,
          count(DISTINCT n) AS count
     ORDER BY count DESC, propVal ASC
-    WITH collect({
-      value: propVal,
-      count: count,
-      nodes: nodes[0..$node_limit]
-    })[0..$cluster_limit] AS clusters
-    RETURN {
-      node_type: $node_type,
-      property_key: $property_key,
-      section_query: $section_query,
-      clusters: clusters
-    } AS clusterData
+    LIMIT $cluster_limit
+    WITH propVal, count, nodes[0..$node_limit] AS nodes"""
+
+def _escape_identifier(name: str) -> str:
+    return "`" + name.replace("`", "``") + "`"
+
+@lru_cache(maxsize=128)
+def _cluster_data_query(property_key: str, labels: Optional[Tuple[str, ...]] = None) -> str:
+    if labels:
+        clusters = _CLUSTER_TWO_PHASE_TEMPLATE.format(
+            property=_escape_identifier(property_key),
+            label_expr=":" + "|".join(_escape_identifier(label) for label in labels),
+            node_map=_CLUSTER_NODE_MAP,
+        )
+    else:
+        clusters = _CLUSTER_SINGLE_PASS_TEMPLATE.format(
+            property=_escape_identifier(property_key),
+            node_map=_CLUSTER_NODE_MAP,
+        )
+    return _CLUSTER_DATA_TEMPLATE.format(clusters=clusters)
+
+def node_type_labels(node_type: str, labels: List[str]) -> Tuple[str, ...]:
+    """Labels from `labels` that normalize to the frontend `node_type` (e.g. "Place of Performance")."""
+    return tuple(sorted(
+        label for label in labels
+        if label.lower().replace(" ", "_") == node_type or label.lower() == node_type
+    ))
+
+
+def get_cluster_data_query(
+    node_type: str,
+    property_key: str,
+    section_query: Optional[str] = None,
+    cluster_limit: int = 5,
+    node_limit: int = 10,
+    labels: Optional[Tuple[str, ...]] = None
+) -> Tuple[str, dict]:
+    """
+    Query to fetch clustered node samples grouped by a given property key.
+
+    - `node_type` is expected to be a frontend normalized label (e.g. "place_of_performance", "entity", "action").
+      `labels` are the actual Neo4j labels it stands for (see node_type_labels); when given, the query
+      scans only those labels. Otherwise node_type is matched against every node's labels using:
+        replace(toLower(label), ' ', '_') == node_type  OR  toLower(label) == node_type
+    - `property_key` is the Neo4j property name to cluster by.
+    - Optionally filters to a section via `n.section = section_query` if provided.
+
+    Returns a dict shape:
+      {
+        node_type, property_key, section_query,
+        clusters: [{ value, count, nodes: [{id,name}, ...] }, ...]
+      }
     """
 
+    query = _cluster_data_query(property_key, tuple(labels) if labels else None)
+
     params = {
         "node_type": node_type,
         "property_key": property_key,
@@ -458,11 +631,9 @@ def get_cluster_data_query(
 
     return query, params
 
-def get_section_by_id_query(section_gid: str):
-    """Get section details by gid"""
-    return """
+_SECTION_BY_ID_QUERY = """
     MATCH (section:section)
-    WHERE toString(section.gid) = toString($section_gid)
+    WHERE coalesce(section.canonical_id, toString(section.gid)) = toString($section_gid)
     OPTIONAL MATCH (chapter:chapter)-[:chapter_section]-(section)
     RETURN {
         gid: section.gid,
@@ -476,7 +647,11 @@ def get_section_by_id_query(section_gid: str):
             chapter_title: coalesce(chapter.`Chapter Name`, toString(chapter.gid))
         }
     } AS section
-    """, {"section_gid": section_gid}
+    """
+
+def get_section_by_id_query(section_gid: str):
+    """Get section details by gid"""
+    return _SECTION_BY_ID_QUERY, {"section_gid": section_gid}
 
 def get_graph_data_by_section_and_country_query(section_query: str, country_name: str) -> Tuple[str, dict]:
     """
@@ -491,7 +666,7 @@ def get_graph_data_by_section_and_country_query(section_query: str, country_name
     
     query = """
     MATCH (section:section)
-    WHERE toString(section.gid) = toString($section_query)
+    WHERE coalesce(section.canonical_id, toString(section.gid)) = toString($section_query)
        OR section.`Section Name` = $section_query
        OR section.`graph name` = $section_query
     WITH section, toString(section.`graph name`) AS section_graph_name
@@ -508,17 +683,18 @@ def get_graph_data_by_section_and_country_query(section_query: str, country_name
       AND NONE(l IN labels(n) WHERE toLower(l) IN ['story','chapter','section'])
     WITH COLLECT(DISTINCT n) AS all_nodes
 
-    MATCH (a)-[rel]-(b)
-    WHERE a IN all_nodes AND b IN all_nodes
-      AND NONE(l IN labels(a) WHERE toLower(l) IN ['story','chapter','section'])
-      AND NONE(l IN labels(b) WHERE toLower(l) IN ['story','chapter','section'])
+    // Relationships between collected nodes: expand from each node once, following the
+    // relationship direction so every relationship is returned exactly once.
+    UNWIND all_nodes AS a
+    OPTIONAL MATCH (a)-[rel]->(b)
+    WHERE b IN all_nodes
     WITH all_nodes,
-         COLLECT(DISTINCT {
+         COLLECT(CASE WHEN rel IS NOT NULL THEN {
            rel: rel,
            from: a,
            to: b,
            type: type(rel)
-         }) AS all_rels
+         } END) AS all_rels
 
     RETURN {
       nodes: [n IN all_nodes | n {
@@ -545,92 +721,71 @@ def get_graph_data_by_section_and_country_query(section_query: str, country_name
     params = {"section_query": section_query, "country_name": country_name}
     return query, params
 
-def get_calendar_data_by_section_query(section_gid: Optional[str] = None, section_query: Optional[str] = None, section_title: Optional[str] = None) -> Tuple[str, dict]:
-    """
-    Query to fetch calendar/timeline data for a section with distinct timeline and free-floating items.
-    
-    Timeline items (Milestone, Result, Incident, Action) are sorted by:
-    1. Date (chronological)
-    2. Type priority: Milestone (1) → Result/Incident (2) → Action (3)
-    
-    Free-floating items (Entity, Location, Event, etc.) are returned with their connections
-    to timeline items, allowing frontend to position them dynamically based on viewport.
-    """
-    
-    # Build the match clause based on what parameter was provided (new DB: section_query treated as section.gid)
-    if section_gid:
-        match_clause = "MATCH (section:section) WHERE toString(section.gid) = toString($section_gid)"
-        params = {"section_gid": section_gid}
-    elif section_query:
-        match_clause = """
+# Match clause per lookup parameter (new DB: section_query treated as section.gid)
+_CALENDAR_DATA_BY_SECTION_MATCH_CLAUSES = {
+    "section_gid": "MATCH (section:section) WHERE coalesce(section.canonical_id, toString(section.gid)) = toString($section_gid)",
+    "section_query": """
         MATCH (section:section)
-        WHERE toString(section.gid) = toString($section_query)
+        WHERE coalesce(section.canonical_id, toString(section.gid)) = toString($section_query)
            OR section.`Section Name` = $section_query
            OR section.`graph name` = $section_query
-        """
-        params = {"section_query": section_query}
-    elif section_title:
-        match_clause = """
+        """,
+    "section_title": """
         MATCH (section:section)
         WHERE section.`Section Name` = $section_title
            OR section.`graph name` = $section_title
-        """
-        params = {"section_title": section_title}
-    else:
-        raise ValueError("At least one of section_gid, section_query, or section_title must be provided")
-    
-    query = f"""
+        """,
+}
+
+_CALENDAR_DATA_BY_SECTION_TEMPLATE = """
     {match_clause}
     WITH section, toString(section.`graph name`) AS section_graph_name
 
-    // Timeline items: nodes with a usable date and/or event-like labels, where node.gr_id = section.`graph name`
+    // One pass over the section's nodes (node.gr_id = section.`graph name`, non-hierarchy);
+    // timeline items, floating items and relationships are all derived from this list.
     MATCH (n)
     WHERE toString(n.gr_id) = section_graph_name
       AND NONE(l IN labels(n) WHERE toLower(l) IN ['story','chapter','section'])
-      AND (
-        ANY(l IN labels(n) WHERE toLower(l) IN ['action','process','result','event_attend','funding','relationship'])
-        OR coalesce(n.date, n.`Date`, n.`Relationship Date`, n.`Action Date`, n.`Process Date`, n.`Disb Date`) IS NOT NULL
-      )
-    WITH section, section_graph_name,
-         COLLECT(DISTINCT {{
+    WITH section, COLLECT(DISTINCT n) AS all_nodes
+
+    // Relationships between nodes of this section, expanded from each node (both orientations)
+    UNWIND all_nodes AS source
+    OPTIONAL MATCH (source)-[rel]-(target)
+    WHERE target IN all_nodes
+    WITH section, all_nodes,
+         COLLECT(DISTINCT CASE WHEN rel IS NOT NULL THEN [source, rel, target] END) AS rel_rows
+
+    WITH section,
+         // Timeline items: nodes with a usable date and/or event-like labels
+         [n IN all_nodes
+          WHERE ANY(l IN labels(n) WHERE toLower(l) IN ['action','process','result','event_attend','funding','relationship'])
+             OR coalesce(n.date, n.`Date`, n.`Relationship Date`, n.`Action Date`, n.`Process Date`, n.`Disb Date`) IS NOT NULL
+          | {{
            gid: coalesce(toString(n.gid), elementId(n)),
            node_type: head(labels(n)),
            date: coalesce(n.date, n.`Date`, n.`Relationship Date`, n.`Action Date`, n.`Process Date`, n.`Disb Date`),
            name: coalesce(n.title, n.name, n.`Article Title`, n.summary, toString(n.gid)),
            description: coalesce(n.summary, n.`Summary`, n.text, ""),
            properties: n {{ .* }}
-         }}) AS timeline_items
-
-    // Floating items: everything else in the section with matching gr_id (non-hierarchy nodes)
-    MATCH (f)
-    WHERE toString(f.gr_id) = section_graph_name
-      AND NONE(l IN labels(f) WHERE toLower(l) IN ['story','chapter','section'])
-    WITH section, section_graph_name, timeline_items,
-         COLLECT(DISTINCT {{
+         }}] AS timeline_items,
+         // Floating items: every node in the section
+         [f IN all_nodes | {{
            gid: coalesce(toString(f.gid), elementId(f)),
            node_type: head(labels(f)),
            name: coalesce(f.title, f.name, f.`Article Title`, f.summary, toString(f.gid)),
            description: coalesce(f.summary, f.`Summary`, f.text, ""),
            properties: f {{ .* }}
-         }}) AS floating_items
-
-    // Relationships: between all nodes inside this section (by gr_id)
-    MATCH (source)-[rel]-(target)
-    WHERE toString(source.gr_id) = section_graph_name
-      AND toString(target.gr_id) = section_graph_name
-      AND NONE(l IN labels(source) WHERE toLower(l) IN ['story','chapter','section'])
-      AND NONE(l IN labels(target) WHERE toLower(l) IN ['story','chapter','section'])
-    WITH section, timeline_items, floating_items,
-         COLLECT(DISTINCT {{
-           gid: coalesce(toString(rel.gid), elementId(rel)),
-           type: type(rel),
-           source_gid: coalesce(toString(source.gid), elementId(source)),
-           target_gid: coalesce(toString(target.gid), elementId(target)),
-           source_type: head(labels(source)),
-           target_type: head(labels(target)),
-           date: coalesce(rel.date, rel.`Date`, rel.`Relationship Date`),
-           properties: rel {{ .* }}
-         }}) AS relationships
+         }}] AS floating_items,
+         [r IN rel_rows | {{
+           gid: coalesce(toString(r[1].gid), elementId(r[1])),
+           type: type(r[1]),
+           source_gid: coalesce(toString(r[0].gid), elementId(r[0])),
+           target_gid: coalesce(toString(r[2].gid), elementId(r[2])),
+           source_type: head(labels(r[0])),
+           target_type: head(labels(r[2])),
+           date: coalesce(r[1].date, r[1].`Date`, r[1].`Relationship Date`),
+           properties: r[1] {{ .* }}
+         }}] AS relationships
 
     RETURN {{
       section_query: toString(section.gid),
@@ -640,8 +795,25 @@ def get_calendar_data_by_section_query(section_gid: Optional[str] = None, sectio
       relationships: relationships
     }} AS calendarData
     """
+
+_CALENDAR_DATA_BY_SECTION_QUERIES = {
+    key: _CALENDAR_DATA_BY_SECTION_TEMPLATE.format(match_clause=clause)
+    for key, clause in _CALENDAR_DATA_BY_SECTION_MATCH_CLAUSES.items()
+}
+
+def get_calendar_data_by_section_query(section_gid: Optional[str] = None, section_query: Optional[str] = None, section_title: Optional[str] = None) -> Tuple[str, dict]:
+    """
+    Query to fetch calendar/timeline data for a section with distinct timeline and free-floating items.
     
-    return query, params
+    Timeline items (Milestone, Result, Incident, Action) are sorted by:
+    1. Date (chronological)
+    2. Type priority: Milestone (1) → Result/Incident (2) → Action (3)
+    
+    Free-floating items (Entity, Location, Event, etc.) are returned with their connections
+    to timeline items, allowing frontend to position them dynamically based on viewport.
+    """
+    key, value = _select_section_param(section_gid, section_query, section_title)
+    return _CALENDAR_DATA_BY_SECTION_QUERIES[key], {key: value}
 
 def get_story_statistics(story_id: str) -> Dict[str, Any]:
     """Get statistics for a story (total nodes, entity count, etc.)"""
@@ -692,32 +864,37 @@ def get_story_statistics(story_id: str) -> Dict[str, Any]:
 
 
 
-def get_story_statistics_query_legacy(story_gid: Optional[str] = None, story_title: Optional[str] = None):
-    """Legacy statistics query for :story/:chapter/:section schema (section.`graph name`, n.gr_id)."""
-    if story_gid:
-        match_clause = "MATCH (story:story) WHERE toString(story.gid) = toString($story_gid)"
-        params = {"story_gid": story_gid}
-    elif story_title:
-        match_clause = "MATCH (story:story) WHERE story.`Story Name` = $story_title"
-        params = {"story_title": story_title}
-    else:
-        raise ValueError("Either story_gid or story_title must be provided")
+_STORY_STATISTICS_LEGACY_MATCH_CLAUSES = {
+    "story_gid": "MATCH (story:story) WHERE coalesce(story.canonical_id, toString(story.gid)) = toString($story_gid)",
+    "story_title": "MATCH (story:story) WHERE story.`Story Name` = $story_title",
+    "story_key": """
+        MATCH (story:story)
+        WHERE coalesce(story.canonical_id, toString(story.gid)) = toString($story_key) OR story.`Story Name` = $story_key
+        WITH story
+        ORDER BY CASE WHEN coalesce(story.canonical_id, toString(story.gid)) = toString($story_key) THEN 0 ELSE 1 END
+        LIMIT 1
+        """,
+}
 
-    query = f"""
+_STORY_STATISTICS_LEGACY_TEMPLATE = """
     {match_clause}
-    OPTIONAL MATCH (story)-[:story_chapter]-(chapter:chapter)
-    OPTIONAL MATCH (chapter)-[:chapter_section]-(section:section)
+    // Section graph names in one pattern comprehension (duplicates are harmless for IN)
     WITH story,
-         COLLECT(DISTINCT toString(section.`graph name`)) AS section_graph_names
-    WITH story, [g IN section_graph_names WHERE g IS NOT NULL AND g <> ""] AS section_graph_names
-
-    MATCH (n)
-    WHERE toString(n.gr_id) IN section_graph_names
-      AND NONE(l IN labels(n) WHERE toLower(l) IN ['story','chapter','section'])
+         [(story)-[:story_chapter]-(:chapter)-[:chapter_section]-(section:section)
+          WHERE section.`graph name` IS NOT NULL AND toString(section.`graph name`) <> ""
+          | toString(section.`graph name`)] AS section_graph_names
+    // Numeric twins of the names, so members imported with a numeric gr_id (not yet
+    // rewritten by migrate_neo4j_indexes.py) still match the per-label gr_id seeks
+    WITH story, section_graph_names,
+         section_graph_names
+           + [g IN section_graph_names WHERE toString(toInteger(g)) = g | toInteger(g)]
+           + [g IN section_graph_names WHERE toString(toFloat(g)) = g | toFloat(g)] AS section_gr_ids
+
+    {member_match}
     WITH story,
          COUNT(DISTINCT n) AS total_nodes,
-         COUNT(DISTINCT CASE WHEN ANY(l IN labels(n) WHERE toLower(l) = 'entity') THEN coalesce(toString(n.gid), elementId(n)) ELSE null END) AS entity_count,
-         MAX(coalesce(n.date, n.`Date`, n.`Relationship Date`, n.`Action Date`, n.`Process Date`, n.`Disb Date`)) AS updated_date
+         COUNT(DISTINCT CASE WHEN {entity_test} THEN coalesce(toString(n.gid), elementId(n)) ELSE null END) AS entity_count,
+         MAX(coalesce(n.stats_date, n.date, n.`Date`, n.`Relationship Date`, n.`Action Date`, n.`Process Date`, n.`Disb Date`)) AS updated_date
 
     RETURN {{
       story_id: toString(story.gid),
@@ -728,22 +905,97 @@ def get_story_statistics_query_legacy(story_gid: Optional[str] = None, story_tit
       updated_date: updated_date
     }} AS statistics
     """
-    return query, params
 
-def get_all_node_types_query():
-    """Query to fetch all distinct node types (labels) from the database"""
-    # Use a query that finds all distinct labels by checking actual nodes
-    # This is more reliable than CALL db.labels() which may not work in all Neo4j versions
-    query = """
-    // New DB: return normalized label names for nodes that participate in graphs (by gr_id).
-    MATCH (n)
-    WHERE n.gr_id IS NOT NULL
-      AND NONE(l IN labels(n) WHERE toLower(l) IN ['story','chapter','section'])
-    WITH labels(n) AS nodeLabels
-    UNWIND nodeLabels AS label
+_HIERARCHY_LABELS = ('story', 'chapter', 'section')
+
+def _legacy_member_match(labels: Optional[Tuple[str, ...]]) -> str:
+    """Match the nodes of the story's sections (bound as n). With the label catalogue known, scan
+    each non-hierarchy label separately (UNION) instead of every node in the graph.
+    The per-label branches compare n.gr_id as stored against the string and numeric forms of the
+    graph names, so the gr_id index can be used whether or not the node has been migrated."""
+    member_labels = [label for label in labels or () if label.lower() not in _HIERARCHY_LABELS]
+    if not member_labels:
+        return """MATCH (n)
+    WHERE toString(n.gr_id) IN section_graph_names
+      AND NONE(l IN labels(n) WHERE toLower(l) IN ['story','chapter','section'])"""
+    branches = "\n      UNION\n".join(
+        f"""      WITH section_gr_ids
+      MATCH (n:{_escape_identifier(label)})
+      WHERE n.gr_id IN section_gr_ids
+      RETURN n"""
+        for label in member_labels
+    )
+    return f"""CALL {{
+{branches}
+    }}
+    WITH story, n
+    WHERE NONE(l IN labels(n) WHERE toLower(l) IN ['story','chapter','section'])"""
+
+def _entity_test(labels: Optional[Tuple[str, ...]]) -> str:
+    """Predicate for "n is an entity": a label check when the catalogue is known."""
+    if labels is None:
+        return "ANY(l IN labels(n) WHERE toLower(l) = 'entity')"
+    entity_labels = [label for label in labels if label.lower() == 'entity']
+    if not entity_labels:
+        return "false"
+    return "n:" + "|".join(_escape_identifier(label) for label in entity_labels)
+
+@lru_cache(maxsize=32)
+def _story_statistics_legacy_query(key: str, labels: Optional[Tuple[str, ...]] = None) -> str:
+    return _STORY_STATISTICS_LEGACY_TEMPLATE.format(
+        match_clause=_STORY_STATISTICS_LEGACY_MATCH_CLAUSES[key],
+        member_match=_legacy_member_match(labels),
+        entity_test=_entity_test(labels),
+    )
+
+def get_story_statistics_query_legacy(story_gid: Optional[str] = None, story_title: Optional[str] = None,
+                                      story_key: Optional[str] = None, labels: Optional[Tuple[str, ...]] = None):
+    """Legacy statistics query for :story/:chapter/:section schema (section.`graph name`, n.gr_id).
+    `labels` is the database label catalogue; when given, section members are scanned per label."""
+    key, value = _select_story_param(story_gid, story_title, story_key)
+    return _story_statistics_legacy_query(key, tuple(labels) if labels else None), {key: value}
+
+@lru_cache(maxsize=32)
+def _story_statistics_legacy_batch_query(labels: Optional[Tuple[str, ...]] = None) -> str:
+    return _STORY_STATISTICS_BATCH_TEMPLATE.format(
+        body=_story_statistics_legacy_query("story_key", labels).replace("$story_key", "story_key")
+    )
+
+def get_story_statistics_batch_query_legacy(story_ids: List[str], labels: Optional[Tuple[str, ...]] = None) -> Tuple[str, dict]:
+    """Legacy batch statistics query for :story/:chapter/:section schema; one row per matched key."""
+    return (
+        _story_statistics_legacy_batch_query(tuple(labels) if labels else None),
+        {"story_ids": [str(story_id) for story_id in story_ids]},
+    )
+
+# Reads the label catalogue instead of scanning every node; Neo4j 5 only lists labels in use.
+_ALL_NODE_TYPES_QUERY = """
+    // Return normalized label names, excluding the story/chapter/section hierarchy labels.
+    CALL db.labels() YIELD label
     WITH label
-    WHERE toLower(label) NOT IN ['story','chapter','section']
+    WHERE NOT toLower(label) IN ['story','chapter','section','gr_id']
     RETURN DISTINCT replace(toLower(label), ' ', '_') AS node_type
     ORDER BY node_type
     """
-    return query, {}
+
+def get_all_node_types_query():
+    """Query to fetch all distinct node types (labels) from the database"""
+    return _ALL_NODE_TYPES_QUERY, {}
+
+_ALL_LABELS_QUERY = """
+    CALL db.labels() YIELD label
+    RETURN label
+    """
+
+def get_all_labels_query():
+    """Query to fetch the raw label names in use"""
+    return _ALL_LABELS_QUERY, {}
+
+_ALL_PROPERTY_KEYS_QUERY = """
+    CALL db.propertyKeys() YIELD propertyKey
+    RETURN propertyKey
+    """
+
+def get_all_property_keys_query():
+    """Query to fetch the property key names known to the database"""
+    return _ALL_PROPERTY_KEYS_QUERY, {}
@@ -1,15 +1,25 @@
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, Callable
 import logging
+import re
+import threading
+import time
+from functools import lru_cache
 from database import db
 from queries import (
     get_all_stories_query,
     get_all_stories_query_legacy,
+    has_gr_id_stories_query,
     get_graph_data_by_section_query,
     get_graph_data_by_section_query_legacy,
     get_graph_data_by_section_and_country_query,
     get_story_statistics_query,
     get_story_statistics_query_legacy,
+    get_story_statistics_batch_query,
+    get_story_statistics_batch_query_legacy,
     get_all_node_types_query,
+    get_all_labels_query,
+    get_all_property_keys_query,
+    node_type_labels,
     get_calendar_data_by_section_query,
     get_cluster_data_query
 )
@@ -17,9 +27,93 @@ from models import Story, Chapter, Substory, Node, Link, GraphData
 
 logger = logging.getLogger(__name__)
 
+_CYPHER_KEYWORDS = (
+    "MATCH", "CREATE", "MERGE", "SET", "DELETE", "DETACH", "REMOVE",
+    "RETURN", "WITH", "WHERE", "UNWIND", "CALL", "USING", "UNION",
+    "FOREACH", "OPTIONAL"
+)
+# One pass over the text for every keyword; word boundaries keep "assets" from matching SET
+_CYPHER_KEYWORD_RE = re.compile(r'\b(?:' + '|'.join(_CYPHER_KEYWORDS) + r')\b', re.IGNORECASE)
+
+# Keys format_link derives itself; never copied through from the raw link record
+_LINK_RESERVED_KEYS = frozenset({
+    "id", "gid", "sourceId", "targetId", "from_gid", "to_gid", "title", "label", "category", "type"
+})
+
+# [[Entity Name]] markers emitted by the AI summary
+_ENTITY_MARKER_RE = re.compile(r'\[\[([^\]]+)\]\]')
+
+# Story listings, story statistics and node types are read on every page load but only change on data imports
+READ_CACHE_TTL_SECONDS = 60
+READ_CACHE_MAX_ENTRIES = 64
+_read_cache: Dict[Tuple, Tuple[float, Any]] = {}
+# Guards _read_cache and _read_cache_key_locks; each key gets its own load lock (with a
+# count of threads using it) so a slow load only blocks callers waiting on the same key.
+_read_cache_lock = threading.Lock()
+_read_cache_key_locks: Dict[Tuple, List[Any]] = {}
+
+
+def _cached_read(key: Tuple, load: Callable[[], Any]) -> Any:
+    """Return load() memoized for READ_CACHE_TTL_SECONDS; concurrent misses share one load.
+    Empty results are not cached so a cold or unavailable database is retried."""
+    entry = _read_cache.get(key)
+    if entry and entry[0] > time.monotonic():
+        return entry[1]
+    with _read_cache_lock:
+        key_lock = _read_cache_key_locks.setdefault(key, [threading.Lock(), 0])
+        key_lock[1] += 1
+    try:
+        with key_lock[0]:
+            entry = _read_cache.get(key)
+            if entry and entry[0] > time.monotonic():
+                return entry[1]
+            value = load()
+            if value:
+                with _read_cache_lock:
+                    now = time.monotonic()
+                    if len(_read_cache) >= READ_CACHE_MAX_ENTRIES:
+                        for stale_key in [k for k, (expires, _) in _read_cache.items() if expires <= now]:
+                            del _read_cache[stale_key]
+                    if len(_read_cache) < READ_CACHE_MAX_ENTRIES:
+                        _read_cache[key] = (now + READ_CACHE_TTL_SECONDS, value)
+            return value
+    finally:
+        with _read_cache_lock:
+            key_lock[1] -= 1
+            if key_lock[1] == 0:
+                del _read_cache_key_locks[key]
+
+def clear_read_cache() -> None:
+    """Drop every cached read; called after writes so new nodes show up without waiting for the TTL."""
+    with _read_cache_lock:
+        _read_cache.clear()
+
+def _label_catalogue() -> Optional[Tuple[str, ...]]:
+    """Label names in use (cached); None when the catalogue cannot be read."""
+    query, params = get_all_labels_query()
+    rows = _cached_read(("labels",), lambda: db.execute_query(query, params))
+    if not rows:
+        return None
+    return tuple(sorted(row["label"] for row in rows if row.get("label")))
+
+def _property_key_catalogue() -> Optional[frozenset]:
+    """Property key names known to the database (cached); None when they cannot be read."""
+    query, params = get_all_property_keys_query()
+    rows = _cached_read(("property_keys",), lambda: db.execute_query(query, params))
+    if not rows:
+        return None
+    return frozenset(row["propertyKey"] for row in rows if row.get("propertyKey"))
+
 def generate_id_from_title(title: str) -> str:
     return title.lower().replace(' ', '_').replace('&', 'and').replace('/', '_').replace("'", '').replace('-', '_')
 
+# A graph carries only a handful of distinct labels, so each is normalized once
+@lru_cache(maxsize=1024)
+def _normalize_label(label: str) -> str:
+    # Normalize labels to match frontend filtering/grouping conventions
+    # e.g. "USAID Program Region" -> "usaid_program_region"
+    return label.strip().lower().replace(" ", "_")
+
 def format_node(node_data: Dict[str, Any]) -> Dict[str, Any]:
     gid_value = node_data.get("gid")
     element_id = node_data.get("elementId") or node_data.get("element_id")
@@ -36,13 +130,8 @@ def format_node(node_data: Dict[str, Any]) -> Dict[str, Any]:
     if not raw_node_type and isinstance(node_data.get("labels"), list) and node_data.get("labels"):
         raw_node_type = node_data["labels"][0]
 
-    def normalize_label(label: str) -> str:
-        # Normalize labels to match frontend filtering/grouping conventions
-        # e.g. "USAID Program Region" -> "usaid_program_region"
-        return str(label).strip().lower().replace(" ", "_")
-
     node_type_raw = str(raw_node_type) if raw_node_type is not None else ""
-    node_type = normalize_label(node_type_raw) if node_type_raw else ""
+    node_type = _normalize_label(node_type_raw) if node_type_raw else ""
 
     name_val = (
         node_data.get("name")
@@ -54,6 +143,7 @@ def format_node(node_data: Dict[str, Any]) -> Dict[str, Any]:
         or node_data.get("Summary")
     )
 
+    highlight = node_data.get("highlight")
     node = {
         "id": node_id,
         "gid": gid_value,
@@ -64,7 +154,7 @@ def format_node(node_data: Dict[str, Any]) -> Dict[str, Any]:
         "section": node_data.get("section"),
         "category": None,
         "color": None,
-        "highlight": bool(node_data.get("highlight")) if node_data.get("highlight") is not None else False,
+        "highlight": bool(highlight) if highlight is not None else False,
     }
 
     # Pass through all additional properties (keep original keys/casing from Neo4j)
@@ -89,7 +179,7 @@ def format_link(link_data: Dict[str, Any]) -> Dict[str, Any]:
     }
 
     for key, value in link_data.items():
-        if key not in ["id", "gid", "sourceId", "targetId", "from_gid", "to_gid", "title", "label", "category", "type"] and value is not None:
+        if key not in _LINK_RESERVED_KEYS and value is not None:
             link[key] = value
 
     return link
@@ -98,22 +188,18 @@ def is_cypher_query(query: str) -> bool:
     if not query or not query.strip():
         return False
 
-    query_upper = query.strip().upper()
+    query_stripped = query.strip()
 
-    cypher_keywords = [
-        "MATCH", "CREATE", "MERGE", "SET", "DELETE", "DETACH", "REMOVE",
-        "RETURN", "WITH", "WHERE", "UNWIND", "CALL", "USING", "UNION",
-        "FOREACH", "OPTIONAL"
-    ]
+    if _CYPHER_KEYWORD_RE.match(query_stripped):
+        return True
 
-    for keyword in cypher_keywords:
-        if query_upper.startswith(keyword):
+    # Two or more distinct keywords anywhere in the text
+    seen_keywords = set()
+    for match in _CYPHER_KEYWORD_RE.finditer(query_stripped):
+        seen_keywords.add(match.group(0).upper())
+        if len(seen_keywords) >= 2:
             return True
 
-    keyword_count = sum(1 for keyword in cypher_keywords if keyword in query_upper)
-    if keyword_count >= 2:
-        return True
-
     return False
 
 def extract_graph_data_from_cypher_results(results: List[Dict[str, Any]]) -> GraphData:
@@ -182,16 +268,30 @@ def extract_graph_data_from_cypher_results(results: List[Dict[str, Any]]) -> Gra
 
     return GraphData(nodes=unique_nodes, links=unique_links)
 
-def get_all_stories() -> List[Story]:
+def _stories_schema() -> str:
+    """Return "gr_id" when any gr_id story exists, else "legacy" (:story/:chapter/:section)."""
+    def load_schema():
+        query, params = has_gr_id_stories_query()
+        return "gr_id" if db.execute_query(query, params) else "legacy"
+
+    return _cached_read(("stories_schema",), load_schema)
+
+
+def get_all_stories(offset: int = 0, limit: Optional[int] = None) -> List[Story]:
     try:
-        logger.debug("Fetching all stories from database")
-        query = get_all_stories_query()
-        results = db.execute_query(query)
-        # Fallback to legacy :story/:chapter/:section schema if gr_id returns no rows
-        if not results:
-            logger.debug("No results from gr_id schema, trying legacy story/chapter/section query")
-            query_legacy = get_all_stories_query_legacy()
-            results = db.execute_query(query_legacy)
+        # Decide the schema once rather than per page, so an empty page past the end of the
+        # gr_id stories does not fall through to the legacy query.
+        schema = _stories_schema()
+
+        def load_stories():
+            logger.debug(f"Fetching {schema} stories from database (offset={offset}, limit={limit})")
+            if schema == "gr_id":
+                query, params = get_all_stories_query(offset=offset, limit=limit)
+            else:
+                query, params = get_all_stories_query_legacy(offset=offset, limit=limit)
+            return db.execute_query(query, params)
+
+        results = _cached_read(("stories", schema, offset, limit), load_stories)
         logger.debug(f"Retrieved {len(results)} story records from database")
 
         stories = []
@@ -498,15 +598,35 @@ def get_cluster_data(
         raise ValueError("property_key is required")
 
     try:
+        # The key is inlined into the Cypher text, so only known keys may create a new query plan
+        property_keys = _property_key_catalogue()
+        if property_keys is not None and str(property_key).strip() not in property_keys:
+            raise ValueError(f"Unknown property_key: {property_key}")
+
         # Normalize node_type coming from the UI (db.schema.nodeTypeProperties() returns labels with casing/spaces).
         node_type_normalized = str(node_type).strip().lower().replace(" ", "_")
 
+        # Resolve the normalized type to its actual labels so the query scans only those labels.
+        # If the label catalogue is unavailable, the query falls back to matching labels per node.
+        catalogue = _label_catalogue()
+        labels = None
+        if catalogue:
+            labels = node_type_labels(node_type_normalized, list(catalogue))
+            if not labels:
+                return {
+                    "node_type": node_type_normalized,
+                    "property_key": property_key,
+                    "section_query": section_query,
+                    "clusters": []
+                }
+
         query, params = get_cluster_data_query(
             node_type=node_type_normalized,
             property_key=str(property_key).strip(),
             section_query=section_query,
             cluster_limit=int(cluster_limit),
             node_limit=int(node_limit),
+            labels=labels,
         )
 
         results = db.execute_query(query, params)
@@ -598,65 +718,76 @@ def search_with_ai(user_query: str) -> Tuple[GraphData, str]:
             raise ValueError("Database connection error. Please try again later.")
         raise ValueError(f"An error occurred during search: {error_msg}")
 
+def _format_story_statistics(story_id: str, stats: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "story_id": story_id,
+        "total_nodes": stats.get("total_nodes", 0) or 0,
+        "entity_count": stats.get("entity_count", 0) or 0,
+        "highlighted_nodes": stats.get("highlighted_nodes", 0) or 0,
+        "updated_date": stats.get("updated_date", None)
+    }
+
 def get_story_statistics(story_id: str) -> Dict[str, Any]:
     """Get statistics for a story (total nodes, entity count, etc.)"""
     try:
         logger.debug(f"Fetching statistics for story: {story_id}")
-        # Try gr_id schema by story_gid first, then by story_title
-        query, params = get_story_statistics_query(story_gid=story_id)
+        # gr_id schema, matching story id or title in one query (id match preferred)
+        query, params = get_story_statistics_query(story_key=story_id)
         results = db.execute_query(query, params)
-        if not results or len(results) == 0:
-            logger.debug(f"No results for story_gid, trying story_title: {story_id}")
-            query, params = get_story_statistics_query(story_title=story_id)
-            results = db.execute_query(query, params)
         # Fallback to legacy :story/:chapter/:section schema
         if not results or len(results) == 0:
             logger.debug("No results from gr_id schema, trying legacy story statistics query")
-            query, params = get_story_statistics_query_legacy(story_gid=story_id)
-            results = db.execute_query(query, params)
-        if not results or len(results) == 0:
-            query, params = get_story_statistics_query_legacy(story_title=story_id)
+            query, params = get_story_statistics_query_legacy(story_key=story_id, labels=_label_catalogue())
             results = db.execute_query(query, params)
         if not results or len(results) == 0:
             logger.warning(f"No statistics found for story: {story_id}")
-            return {
-                "story_id": story_id,
-                "total_nodes": 0,
-                "entity_count": 0,
-                "highlighted_nodes": 0,
-                "updated_date": None
-            }
-        
+            return _format_story_statistics(story_id, {})
+
         stats = results[0].get("statistics", {})
-        total_nodes = stats.get("total_nodes", 0) or 0
-        entity_count = stats.get("entity_count", 0) or 0
-        highlighted_nodes = stats.get("highlighted_nodes", 0) or 0
-        updated_date = stats.get("updated_date", None)
-        
-        logger.debug(f"Statistics for {story_id}: {total_nodes} nodes, {entity_count} entities, {highlighted_nodes} highlighted")
-        return {
-            "story_id": story_id,
-            "total_nodes": total_nodes,
-            "entity_count": entity_count,
-            "highlighted_nodes": highlighted_nodes,
-            "updated_date": updated_date
-        }
+        logger.debug(f"Statistics for {story_id}: {stats.get('total_nodes')} nodes, {stats.get('entity_count')} entities")
+        return _format_story_statistics(story_id, stats)
     except Exception as e:
         # Return default values on error (same shape as success/not-found)
         logger.error(f"Error fetching statistics for story {story_id}: {str(e)}", exc_info=True)
-        return {
-            "story_id": story_id,
-            "total_nodes": 0,
-            "entity_count": 0,
-            "highlighted_nodes": 0,
-            "updated_date": None
-        }
+        return _format_story_statistics(story_id, {})
+
+def _load_story_statistics(story_ids: List[str], labels: Optional[Tuple[str, ...]]) -> Dict[str, Dict[str, Any]]:
+    """Raw statistics per matched story id: gr_id schema first, then legacy for the rest."""
+    found: Dict[str, Dict[str, Any]] = {}
+    query, params = get_story_statistics_batch_query(story_ids)
+    for record in db.execute_query(query, params) or []:
+        found[record["story_key"]] = record.get("statistics") or {}
+    # Fallback to legacy :story/:chapter/:section schema for keys the gr_id schema did not match
+    missing = [story_id for story_id in story_ids if story_id not in found]
+    if missing:
+        query, params = get_story_statistics_batch_query_legacy(missing, labels=labels)
+        for record in db.execute_query(query, params) or []:
+            found[record["story_key"]] = record.get("statistics") or {}
+    return found
+
+def get_story_statistics_batch(story_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Statistics for several stories in one round trip per schema, keyed by the requested story id."""
+    story_ids = list(dict.fromkeys(str(story_id) for story_id in story_ids if story_id))
+    found: Dict[str, Dict[str, Any]] = {}
+    if not story_ids:
+        return {}
+    try:
+        # The home page asks for the same story list on every load; statistics only change on imports.
+        # Labels are resolved first: _cached_read's lock is not re-entrant.
+        labels = _label_catalogue()
+        found = _cached_read(
+            ("story_statistics", tuple(sorted(story_ids))),
+            lambda: _load_story_statistics(story_ids, labels)
+        ) or {}
+    except Exception as e:
+        logger.error(f"Error fetching batch statistics for {len(story_ids)} stories: {str(e)}", exc_info=True)
+    return {story_id: _format_story_statistics(story_id, found.get(story_id, {})) for story_id in story_ids}
 
 def get_all_node_types() -> List[str]:
     """Get all distinct node types from the database"""
     try:
         query, params = get_all_node_types_query()
-        results = db.execute_query(query, params)
+        results = _cached_read(("node_types",), lambda: db.execute_query(query, params))
         
         if not results:
             # Fallback: return hardcoded list if query fails
@@ -737,6 +868,7 @@ def generate_graph_summary(query: str, graph_data: dict) -> dict:
         Dict with summary text containing [[Entity Name]] markers
     """
     from config import Config
+    from ai_service import grok_session
     import requests
     
     if not Config.GROK_API_KEY:
@@ -827,7 +959,7 @@ Generate the summary:"""
             "max_tokens": 1000
         }
         
-        response = requests.post(
+        response = grok_session.post(
             Config.GROK_API_URL,
             headers=headers,
             json=payload,
@@ -851,8 +983,7 @@ Generate the summary:"""
             raise ValueError("AI service returned empty summary")
         
         # Extract entity names from the summary (those in [[brackets]])
-        import re
-        mentioned_entities = re.findall(r'\[\[([^\]]+)\]\]', summary_text)
+        mentioned_entities = _ENTITY_MARKER_RE.findall(summary_text)
         
         # Validate that mentioned entities exist in the graph
         valid_entities = []
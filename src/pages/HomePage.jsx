@@ -29,6 +29,9 @@ import { FaProjectDiagram, FaTable, FaCode, FaSearch, FaDownload, FaCube, FaSqua
 import { FiUser, FiLogOut, FiChevronDown } from 'react-icons/fi';
 import { getNodeTypeColor } from '../utils/colorUtils';
 
+// Most story ids the statistics endpoint accepts per request (STORIES_PAGE_MAX_SIZE in backend/main.py)
+const STATISTICS_BATCH_SIZE = 200;
+
 const HomePage = () => {
   const location = useLocation();
   const navigate = useNavigate();
@@ -1313,30 +1316,34 @@ const HomePage = () => {
     if (!stories || stories.length === 0) return;
 
     const apiBaseUrl = import.meta.env.VITE_API_BASE_URL || 'http://localhost:8000';
+    const emptyStatistics = { total_nodes: 0, entity_count: 0, highlighted_nodes: 0, updated_date: null };
+    const fetchBatch = async (storyIds) => {
+      try {
+        const response = await fetch(`${apiBaseUrl}/api/stories/statistics`, {
+          method: 'POST',
+          headers: {
+            'Content-Type': 'application/json',
+          },
+          body: JSON.stringify({ story_ids: storyIds }),
+        });
+
+        return response.ok ? await response.json() : {};
+      } catch {
+        return {};
+      }
+    };
     const fetchStatistics = async () => {
-      const statsPromises = stories.map(async (story) => {
-        try {
-          const response = await fetch(`${apiBaseUrl}/api/stories/${encodeURIComponent(story.id)}/statistics`, {
-            method: 'GET',
-            headers: {
-              'Content-Type': 'application/json',
-            },
-          });
-          
-          if (response.ok) {
-            const data = await response.json();
-            return { storyId: story.id, statistics: data };
-          }
-          return { storyId: story.id, statistics: { total_nodes: 0, entity_count: 0, highlighted_nodes: 0, updated_date: null } };
-        } catch {
-          return { storyId: story.id, statistics: { total_nodes: 0, entity_count: 0, highlighted_nodes: 0, updated_date: null } };
-        }
-      });
+      // Batch requests of up to STATISTICS_BATCH_SIZE stories instead of one request per story
+      const storyIds = stories.map((story) => String(story.id));
+      const requests = [];
+      for (let start = 0; start < storyIds.length; start += STATISTICS_BATCH_SIZE) {
+        requests.push(fetchBatch(storyIds.slice(start, start + STATISTICS_BATCH_SIZE)));
+      }
+      const batch = Object.assign({}, ...(await Promise.all(requests)));
 
-      const results = await Promise.all(statsPromises);
       const statsMap = {};
-      results.forEach(({ storyId, statistics }) => {
-        statsMap[storyId] = statistics;
+      stories.forEach((story) => {
+        statsMap[story.id] = batch[String(story.id)] || emptyStatistics;
       });
       setStoryStatistics(statsMap);
     };